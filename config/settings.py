@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 import os
+import sys
 from pathlib import Path
 from celery import Celery
 from celery.schedules import crontab
@@ -17,6 +18,9 @@ from celery.schedules import crontab
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Make the Scrapy project importable from Django code (crawl runner, ingest worker)
+sys.path.append(str(BASE_DIR / 'scraper_service'))
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
 
@@ -37,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     # Third-party apps
     'rest_framework',
@@ -93,6 +98,14 @@ if os.environ.get("DATABASE_URL"):
             'PORT': 5432,
         }
     }
+else:
+    # Local runs without Docker (benchmarks, CI)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -138,9 +151,45 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
+# Needed by chords (bulk scrape fan-out) to collect the unit results
+CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+
+# Redis shared with the scrapers (ingest stream, rate limits)
+SCRAPER_REDIS_URL = os.environ.get("SCRAPER_REDIS_URL", CELERY_BROKER_URL)
+# Ingest mode of the bulk sweep units (run_bulk_scrape). "stream" hands the items to the
+# ingest worker (manage.py ingest_jobs), which enriches them on a process pool per core:
+# Celery prefork children are daemonic, can't start one and would enrich on a single thread.
+# "direct" writes from the Celery worker (no ingest worker needed). On-demand scrapes
+# always write directly, their new_jobs count is taken as soon as the crawl ends.
+BULK_SCRAPE_INGEST_MODE = os.environ.get("BULK_SCRAPE_INGEST_MODE", "stream")
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 
+# Shared by every web and worker process (throttles, on-demand scrape locks)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get("CACHE_URL", CELERY_BROKER_URL),
+    }
+}
+
+# On-demand scrapes: one crawl per (keyword, location) at a time, and none again
+# for SCRAPE_COOLDOWN seconds after it finished
+SCRAPE_COOLDOWN = 15 * 60
+# A crawl that never reports back (worker killed) releases its lock after this
+SCRAPE_LOCK_TIMEOUT = 10 * 60
+# Bearer token required by /metrics (unset = the endpoint refuses every request)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# How long a finished scrape's status stays available (GET /api/scrape/<id>/)
+SCRAPE_STATUS_TTL = 60 * 60
+# Long-polls (?wait=N) held at once per server process; past that, status requests answer right away
+SCRAPE_STATUS_MAX_WAITERS = 16
+# Safety net of the /api/jobs/ response cache; writes invalidate it anyway (see jobs.response_cache)
+JOBS_CACHE_TTL = 5 * 60
+# Rows fetched (and streamed) per block by /api/jobs/export/
+JOBS_EXPORT_CHUNK_SIZE = 2000
+
 REST_FRAMEWORK = {
     # 1. Allow everyone in (Public API)
     'DEFAULT_PERMISSION_CLASSES': [
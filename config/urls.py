@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from jobs.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -21,4 +22,7 @@ urlpatterns = [
     # 5. Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+
+    # 6. Prometheus metrics (crawls, pipeline, Celery tasks, API latency)
+    path('metrics', metrics_view, name='metrics'),
 ]
\ No newline at end of file
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 
 class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        # Connects the Celery task timing signals
+        from . import metrics  # noqa: F401
@@ -0,0 +1,121 @@
+import os
+import threading
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.log import configure_logging
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+from twisted.internet.defer import DeferredList, DeferredSemaphore, maybeDeferred
+from twisted.internet.threads import blockingCallFromThread
+from twisted.python.failure import Failure
+
+# Stats holding the time spent in each stage of a crawl, in seconds
+STAGE_STATS = {
+    'parse': 'spider/parse_seconds',
+    'dedupe': 'pipeline/dedupe_seconds',
+    'enrich': 'pipeline/enrich_seconds',
+    'write': 'pipeline/write_seconds',
+}
+
+
+class CrawlRunner:
+    """
+    Runs Scrapy spiders inside the current process.
+
+    The first call starts a Twisted reactor on a daemon thread; every later crawl
+    reuses it, together with this process's Django setup and DB connections.
+    That replaces one `scrapy crawl` subprocess (Python start-up, Scrapy import,
+    django.setup()) per spider run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._reactor = None
+        self._runner = None
+
+    def _start(self):
+        with self._lock:
+            if self._reactor is not None:
+                return
+            thread = threading.Thread(target=self._run_reactor, name='scrapy-reactor', daemon=True)
+            thread.start()
+            self._ready.wait()
+            if self._reactor is None:
+                raise RuntimeError("Could not start the Scrapy reactor, see the worker log")
+
+    def _run_reactor(self):
+        try:
+            self._setup()
+        finally:
+            self._ready.set()
+        if self._reactor is not None:
+            self._reactor.run(installSignalHandlers=False)
+
+    def _setup(self):
+        # scraper_service is on sys.path (see config/settings.py)
+        os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'scraper_service.settings')
+
+        scrapy_settings = get_project_settings()
+        # Installed from this thread so the asyncio loop belongs to it.
+        # Nothing may import twisted.internet.reactor before this point.
+        install_reactor(scrapy_settings['TWISTED_REACTOR'])
+        from twisted.internet import reactor
+
+        configure_logging(scrapy_settings, install_root_handler=False)
+        self._runner = CrawlerRunner(scrapy_settings)
+        self._reactor = reactor
+
+    def run(self, crawls, concurrency=1, ingest_mode=None):
+        """
+        Runs crawls, a list of (spider_name, spider_kwargs), at most `concurrency`
+        at a time. Blocks until all of them finish.
+        ingest_mode ("direct" or "stream") overrides SCRAPER_INGEST_MODE for these crawls.
+        Returns one result dict per crawl, in the same order.
+        """
+        self._start()
+        return blockingCallFromThread(self._reactor, self._crawl_all, list(crawls), concurrency, ingest_mode)
+
+    def _crawl_all(self, crawls, concurrency, ingest_mode):
+        semaphore = DeferredSemaphore(concurrency)
+        runs = [semaphore.run(self._crawl, name, kwargs, ingest_mode) for name, kwargs in crawls]
+        d = DeferredList(runs)
+        d.addCallback(lambda outcomes: [result for _, result in outcomes])
+        return d
+
+    def _crawl(self, name, kwargs, ingest_mode=None):
+        crawler = None
+
+        def start():
+            nonlocal crawler
+            crawler = self._runner.create_crawler(name)
+            if ingest_mode:
+                # Settings are frozen when the crawl starts, not before
+                pipelines = crawler.settings.getdict('INGEST_PIPELINES')[ingest_mode]
+                crawler.settings.set('ITEM_PIPELINES', pipelines, priority='cmdline')
+            return self._runner.crawl(crawler, **kwargs)
+
+        def report(outcome):
+            stats = crawler.stats.get_stats() if crawler and crawler.stats else {}
+            failed = isinstance(outcome, Failure)
+            return {
+                'spider': name,
+                'kwargs': kwargs,
+                'items': stats.get('item_scraped_count', 0),
+                'requests': stats.get('downloader/request_count', 0),
+                'errors': stats.get('log_count/ERROR', 0),
+                'finish_reason': 'error' if failed else stats.get('finish_reason'),
+                'error': outcome.getErrorMessage() if failed else None,
+                'elapsed': stats.get('elapsed_time_seconds'),
+                'timings': {stage: stats.get(key, 0.0) for stage, key in STAGE_STATS.items()},
+            }
+
+        # A failing crawl (unknown spider, broken pipeline...) is reported, not raised
+        return maybeDeferred(start).addBoth(report)
+
+
+# One runner (and reactor) per process, e.g. per Celery worker child
+crawl_runner = CrawlRunner()
+
+
+def run_crawls(crawls, concurrency=1, ingest_mode=None):
+    return crawl_runner.run(crawls, concurrency=concurrency, ingest_mode=ingest_mode)
@@ -0,0 +1,51 @@
+import csv
+import io
+from itertools import islice
+
+import orjson
+
+from .serializers import serialize_job_rows
+
+
+def row_chunks(queryset, fields, chunk_size):
+    """
+    Serialized jobs (see serialize_job_rows), chunk_size at a time.
+    iterator() reads them through a server-side cursor on Postgres, so memory
+    stays bounded by one chunk whatever the size of the export.
+    """
+    rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield serialize_job_rows(chunk, fields)
+
+
+def ndjson_stream(chunks):
+    """One JSON object per line; one bytes block per chunk."""
+    for chunk in chunks:
+        yield b''.join(orjson.dumps(job) + b'\n' for job in chunk)
+
+
+def csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        # skills
+        return ', '.join(value)
+    return value
+
+
+def csv_stream(chunks, fields):
+    """Header line, then one line per job; one bytes block per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        block = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return block
+
+    writer.writerow(fields)
+    yield flush()
+    for chunk in chunks:
+        writer.writerows([csv_cell(job[name]) for name in fields] for job in chunk)
+        yield flush()
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import time
+from functools import cache
+
+import redis
+from django.conf import settings
+from scraper_service.utils import linkedin_job_id, KNOWN_LINKEDIN_JOBS
+
+from .models import Job
+from .response_cache import bump_jobs_generation
+from .search import is_postgres, job_search_vector
+
+logger = logging.getLogger(__name__)
+
+# Scraped fields that define a posting's content. Enrichment only depends on these.
+FINGERPRINT_FIELDS = ('title', 'company', 'location', 'description')
+
+# Columns refreshed when a scraped job is already stored (matched on its unique url)
+UPSERT_FIELDS = [
+    'title', 'company', 'location', 'source', 'posted_at', 'description',
+    'skills', 'seniority', 'salary_min', 'salary_max', 'currency', 'fingerprint',
+]
+
+
+def job_row(item):
+    """Maps a scraped item (JobItem, dict or decoded stream entry) to Job field values."""
+    row = {
+        'url': item.get('url'),
+        'title': item.get('title'),
+        'company': item.get('company'),
+        'location': item.get('location') or "Remote",
+        'source': item.get('source'),
+        'posted_at': item.get('posted_at'),
+        'description': item.get('description'),
+    }
+    row['fingerprint'] = content_fingerprint(row)
+    return row
+
+
+def content_fingerprint(row):
+    """Stable hash of the content fields of a job row (dict of Job field values)."""
+    content = '\x1f'.join(str(row.get(name) or '') for name in FINGERPRINT_FIELDS)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def stored_fingerprints(urls):
+    """Maps each already stored url to its fingerprint, in one query."""
+    return dict(Job.objects.filter(url__in=set(urls)).values_list('url', 'fingerprint'))
+
+
+def changed_rows(rows):
+    """
+    Keeps only the rows that are new or whose content changed since they were stored,
+    using one query to prefetch the stored fingerprints of the whole batch.
+    """
+    if not rows:
+        return rows
+    stored = stored_fingerprints(row['url'] for row in rows)
+    return [row for row in rows if stored.get(row['url']) != row['fingerprint']]
+
+
+def upsert_jobs(rows):
+    """
+    Inserts new jobs and updates existing ones in a single bulk statement keyed on url.
+    Each row is a dict of Job field values. If a url repeats, the last row wins.
+    """
+    # ON CONFLICT can't touch the same row twice in one statement
+    unique_rows = {row['url']: row for row in rows if row.get('url')}
+    if not unique_rows:
+        return []
+
+    jobs = [Job(**row) for row in unique_rows.values()]
+    update_fields = UPSERT_FIELDS
+    if is_postgres():
+        # Computed by the DB within the same statement, so each row is written once
+        for job, row in zip(jobs, unique_rows.values()):
+            job.search_vector = job_search_vector(row)
+        update_fields = UPSERT_FIELDS + ['search_vector']
+
+    jobs = Job.objects.bulk_create(
+        jobs,
+        update_conflicts=True,
+        unique_fields=['url'],
+        update_fields=update_fields,
+    )
+    # Only new or changed rows get here (see changed_rows), so cached lists are stale
+    bump_jobs_generation()
+    return jobs
+
+
+@cache
+def _redis(url):
+    return redis.Redis.from_url(url)
+
+
+def remember_linkedin_jobs(items):
+    """
+    Records the LinkedIn postings of a stored batch (changed or not) as known,
+    so the spider skips their detail page until LINKEDIN_DETAIL_MAX_AGE passes.
+    Call it once the batch is written.
+    """
+    job_ids = {linkedin_job_id(item.get('url')) for item in items if item.get('source') == "LinkedIn"}
+    job_ids.discard(None)
+    if not job_ids or not settings.SCRAPER_REDIS_URL:
+        return
+
+    try:
+        _redis(settings.SCRAPER_REDIS_URL).zadd(KNOWN_LINKEDIN_JOBS, dict.fromkeys(job_ids, time.time()))
+    except redis.RedisError as e:
+        # Only costs extra detail requests on the next crawl
+        logger.warning("Could not record known LinkedIn jobs: %s", e)
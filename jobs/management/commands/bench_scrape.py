@@ -0,0 +1,104 @@
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from jobs.models import Job
+
+SPIDERS = ['wwr', 'remoteok', 'linkedin']
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline throughput benchmark for the scraping stack. --record crawls the network "
+        "and stores every response in a local archive; the default replay mode runs the same "
+        "spiders and pipeline from that archive and reports items/sec, time per stage "
+        "(parse, dedupe, enrich, write) and peak memory of the main process. Replays write "
+        "to a throwaway test DB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--record', action='store_true',
+                            help="Fetch from the network and rewrite the archive.")
+        parser.add_argument('--archive', default=str(Path(settings.BASE_DIR, 'scraper_service', 'archive')),
+                            help="Archive directory (one SQLite file per spider).")
+        parser.add_argument('--spiders', nargs='+', choices=SPIDERS, default=SPIDERS)
+        parser.add_argument('--keyword', default='Python', help="LinkedIn search keyword.")
+        parser.add_argument('--location', default='Europe', help="LinkedIn search location.")
+        parser.add_argument('--repeat', type=int, default=1, help="Number of replay runs.")
+
+    def handle(self, *args, **options):
+        archive = Path(options['archive']).resolve()
+        spiders = options['spiders']
+
+        # Read by scraper_service/settings.py when the crawl runner starts
+        os.environ['SCRAPER_ARCHIVE_MODE'] = 'record' if options['record'] else 'replay'
+        os.environ['SCRAPER_ARCHIVE_DIR'] = str(archive)
+        os.environ['SCRAPER_INGEST_MODE'] = 'direct'
+
+        if options['record']:
+            for name in spiders:
+                Path(archive, f"{name}.sqlite").unlink(missing_ok=True)
+        else:
+            missing = [name for name in spiders if not Path(archive, f"{name}.sqlite").exists()]
+            if missing:
+                raise CommandError(f"No archive for {', '.join(missing)} in {archive}, run with --record first")
+
+        crawls = [
+            (name, {'keyword': options['keyword'], 'location': options['location']} if name == 'linkedin' else {})
+            for name in spiders
+        ]
+
+        # Never touch real jobs, nor the known-jobs set the live spiders rely on
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(SCRAPER_REDIS_URL=None):
+                runs = 1 if options['record'] else options['repeat']
+                for run in range(1, runs + 1):
+                    Job.objects.all().delete()
+                    self.run(crawls, f"{'Record' if options['record'] else 'Replay'} {run}/{runs}")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        # ru_maxrss of this process only: the enrichment worker processes aren't included
+        self.stdout.write(f"Peak memory (main process, excluding enrichment workers): {peak_memory_mb():.1f} MB")
+
+    def run(self, crawls, label):
+        # Imported late: the runner reads the Scrapy settings on first use
+        from jobs.crawler import run_crawls
+
+        started = time.perf_counter()
+        results = run_crawls(crawls, concurrency=1)
+        wall = time.perf_counter() - started
+
+        # Crawls run one after another: throughput is over the sum of their crawl times.
+        # The rest of the wall time is set-up (reactor and settings on the first run,
+        # crawler creation)
+        elapsed = sum(result['elapsed'] or 0 for result in results) or wall
+        items = sum(result['items'] for result in results)
+        self.stdout.write(
+            f"{label}: {items} items in {elapsed:.2f}s ({items / elapsed:.1f} items/s), "
+            f"{wall:.2f}s wall time including {max(wall - elapsed, 0):.2f}s set-up"
+        )
+
+        stages = dict.fromkeys(results[0]['timings'], 0.0)
+        for result in results:
+            self.stdout.write(
+                f"  {result['spider']}: {result['items']} items, {result['requests']} requests, "
+                f"{result['elapsed'] or 0:.2f}s ({result['finish_reason']})"
+            )
+            for stage, seconds in result['timings'].items():
+                stages[stage] += seconds
+        self.stdout.write("  " + " | ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items()))
+
+
+def peak_memory_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
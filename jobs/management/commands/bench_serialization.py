@@ -0,0 +1,96 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from jobs.models import Job
+from jobs.renderers import ORJSONRenderer
+from jobs.serializers import JobSerializer, LIST_DEFERRED_FIELDS, serialize_job_rows
+
+SKILLS = ['Python', 'Django', 'PostgreSQL', 'Docker', 'AWS', 'React', 'Go', 'Kubernetes']
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the /api/jobs/ page rendering: JobSerializer + DRF's JSONRenderer on model "
+        "instances against the values() + serialize_job_rows + orjson path the list view uses. "
+        "Checks that both produce the same JSON. Runs on a throwaway test DB with synthetic jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help="Rows per page (max_page_size is 100).")
+        parser.add_argument('--repeat', type=int, default=200, help="Pages rendered per path.")
+        parser.add_argument('--fields', default='',
+                            help="Comma-separated sparse fieldset (default: the list's default fields).")
+        parser.add_argument('--with-description', action='store_true', help="Include the description field.")
+
+    def handle(self, *args, **options):
+        available = list(JobSerializer().fields)
+        fields = [name for name in options['fields'].split(',') if name] or [
+            name for name in available if name not in LIST_DEFERRED_FIELDS
+        ]
+        if options['with_description'] and 'description' not in fields:
+            fields.append('description')
+        unknown = set(fields) - set(available)
+        if unknown:
+            raise CommandError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            create_jobs(options['page_size'])
+            self.compare(fields, options['page_size'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def compare(self, fields, page_size, repeat):
+        columns = dict.fromkeys(['id', 'posted_at', *fields])
+        queryset = Job.objects.order_by('-posted_at', '-id')
+
+        def serializer_page():
+            rows = list(queryset.only(*columns)[:page_size])
+            return JSONRenderer().render(JobSerializer(rows, many=True, fields=fields).data)
+
+        def fast_page():
+            rows = list(queryset.values(*columns)[:page_size])
+            return ORJSONRenderer().render(serialize_job_rows(rows, fields))
+
+        if json.loads(serializer_page()) != json.loads(fast_page()):
+            raise CommandError("The fast path and JobSerializer disagree, see serialize_job_rows")
+
+        self.stdout.write(f"{page_size} rows/page, {repeat} pages, fields: {', '.join(fields)}")
+        timings = {}
+        for label, render in [("JobSerializer + JSONRenderer", serializer_page), ("values() + orjson", fast_page)]:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                body = render()
+            timings[label] = (time.perf_counter() - started) / repeat
+            self.stdout.write(f"  {label}: {timings[label] * 1000:.2f} ms/page, {len(body)} bytes")
+
+        slow, fast = timings.values()
+        self.stdout.write(f"  Speed-up: {slow / fast:.1f}x")
+
+
+def create_jobs(count):
+    rng = random.Random(0)
+    Job.objects.bulk_create([
+        Job(
+            title=f"Senior Python Developer {i}",
+            company=f"Company {i % 37}",
+            location=rng.choice(["Remote", "Berlin, Germany", "Sofia, Bulgaria"]),
+            url=f"https://example.com/jobs/{i}",
+            source=rng.choice(["LinkedIn", "WeWorkRemotely", "RemoteOK"]),
+            posted_at=date(2026, 1, 1) + timedelta(days=rng.randint(0, 90)),
+            description="<p>Build and run our Python services.</p>" * 40,
+            skills=rng.sample(SKILLS, 4),
+            seniority="Senior",
+            salary_min=rng.choice([None, 60000]),
+            salary_max=rng.choice([None, 90000]),
+            currency=rng.choice([None, "EUR"]),
+            fingerprint=f"{i:064x}",
+        )
+        for i in range(count)
+    ])
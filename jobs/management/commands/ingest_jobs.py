@@ -0,0 +1,167 @@
+import logging
+import socket
+import time
+
+import redis
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections
+from django.core.management.base import BaseCommand
+from scraper_service.enrichment import Enricher
+from scraper_service.metrics import PIPELINE_STAGE_SECONDS
+from scraper_service.stream import DEAD_LETTER_STREAM, INGEST_STREAM, decode_item
+
+from jobs.ingest import job_row, changed_rows, upsert_jobs, remember_linkedin_jobs
+
+GROUP = "ingest"
+
+# Seconds to wait before retrying after a failed batch, doubled per consecutive failure
+RETRY_BACKOFF = 1
+MAX_RETRY_BACKOFF = 60
+# Deliveries of an entry that keeps failing on its own before it is dead-lettered
+MAX_DELIVERIES = 5
+# DB or Redis unreachable: the whole batch waits, no entry is held responsible
+OUTAGE_ERRORS = (OperationalError, InterfaceError, redis.RedisError)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Ingest worker for SCRAPER_INGEST_MODE=stream: reads scraped items from the "
+        "Redis stream in batches, enriches them and upserts them into the Job table. "
+        "Entries that keep failing are moved to the scraper:items:dead stream."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--block', type=float, default=5.0,
+                            help="Seconds to wait for new entries before flushing a partial batch.")
+        parser.add_argument('--processes', type=int, default=0,
+                            help="Enrichment processes (0 = one per CPU core).")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once the stream is drained instead of waiting for more.")
+        parser.add_argument('--claim-idle', type=float, default=300.0,
+                            help="Seconds after which entries left unacknowledged by another consumer "
+                                 "(e.g. a replaced container) are claimed by this one.")
+
+    def handle(self, *args, **options):
+        client = redis.Redis.from_url(settings.SCRAPER_REDIS_URL, decode_responses=True)
+        consumer = socket.gethostname()
+        enricher = Enricher(options['processes'] or None)
+
+        try:
+            client.xgroup_create(INGEST_STREAM, GROUP, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+        # Entries this consumer read but never acknowledged (crash mid-batch) come first
+        pending = True
+        backoff = RETRY_BACKOFF
+        next_claim = 0
+        while True:
+            try:
+                if not pending and time.monotonic() >= next_claim:
+                    next_claim = time.monotonic() + options['claim_idle']
+                    pending = self.claim_idle(client, consumer, options['claim_idle'], options['batch_size'])
+
+                response = client.xreadgroup(
+                    GROUP, consumer, {INGEST_STREAM: '0' if pending else '>'},
+                    count=options['batch_size'],
+                    block=None if pending else int(options['block'] * 1000),
+                )
+                entries = response[0][1] if response else []
+
+                if not entries:
+                    if pending:
+                        pending = False
+                        continue
+                    if options['once']:
+                        break
+                    continue
+
+                failed = self.ingest_entries(client, entries, enricher)
+            except OUTAGE_ERRORS:
+                # The entries stay unacknowledged and are read again from the pending list
+                logger.exception("Ingest batch failed, retrying in %ss", backoff)
+                failed = True
+            if failed:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_RETRY_BACKOFF)
+                pending = True
+            else:
+                backoff = RETRY_BACKOFF
+
+    def claim_idle(self, client, consumer, min_idle, count):
+        """
+        Takes over the entries other consumers read but left unacknowledged for
+        min_idle seconds (consumer names are host names, which change with the container).
+        Returns whether any were claimed; they are then in this consumer's pending list.
+        """
+        claimed = False
+        start_id = '0-0'
+        while True:
+            # [next start id, claimed entries, deleted ids]
+            start_id, entries, *_ = client.xautoclaim(
+                INGEST_STREAM, GROUP, consumer, int(min_idle * 1000), start_id=start_id, count=count,
+            )
+            claimed = claimed or bool(entries)
+            if start_id == '0-0':
+                break
+        if claimed:
+            logger.info("Claimed idle entries of other consumers")
+        return claimed
+
+    def ingest_entries(self, client, entries, enricher):
+        """
+        Ingests and acknowledges a batch. If it fails for anything but an outage, its
+        entries are ingested one by one: one that fails on its own stays pending, and
+        goes to the dead-letter stream once it was delivered MAX_DELIVERIES times.
+        Returns whether entries were left pending.
+        """
+        try:
+            self.ingest(entries, enricher)
+        except OUTAGE_ERRORS:
+            raise
+        except Exception as e:
+            logger.warning("Ingest batch of %d entries failed (%s), retrying entry by entry", len(entries), e)
+        else:
+            client.xack(INGEST_STREAM, GROUP, *[entry_id for entry_id, _ in entries])
+            return False
+
+        deliveries = {
+            entry['message_id']: entry['times_delivered']
+            for entry in client.xpending_range(INGEST_STREAM, GROUP, entries[0][0], entries[-1][0], len(entries))
+        }
+        left_pending = False
+        for entry_id, fields in entries:
+            try:
+                self.ingest([(entry_id, fields)], enricher)
+            except OUTAGE_ERRORS:
+                raise
+            except Exception as e:
+                if deliveries.get(entry_id, 0) < MAX_DELIVERIES:
+                    logger.warning("Entry %s failed (%s), will retry", entry_id, e)
+                    left_pending = True
+                    continue
+                logger.error("Entry %s failed %d times, dead-lettered: %s", entry_id, deliveries[entry_id], e)
+                client.xadd(DEAD_LETTER_STREAM, {**fields, 'entry_id': entry_id, 'error': repr(e)})
+            client.xack(INGEST_STREAM, GROUP, entry_id)
+        return left_pending
+
+    def ingest(self, entries, enricher):
+        # Long-running worker: drop connections the DB may have timed out
+        close_old_connections()
+
+        # Pending entries trimmed from the stream come back without fields
+        items = [decode_item(fields) for _, fields in entries if fields]
+        with PIPELINE_STAGE_SECONDS.labels('dedupe').time():
+            rows = changed_rows([job_row(item) for item in items])
+        if rows:
+            with PIPELINE_STAGE_SECONDS.labels('enrich').time():
+                enriched = enricher.enrich_blocking(rows)
+            with PIPELINE_STAGE_SECONDS.labels('write').time():
+                upsert_jobs([{**row, **extracted} for row, extracted in zip(rows, enriched)])
+        remember_linkedin_jobs(items)
+
+        self.stdout.write(f"Ingested {len(entries)} items ({len(rows)} new or changed)")
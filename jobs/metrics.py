@@ -0,0 +1,65 @@
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from celery.signals import task_prerun, task_postrun
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+
+# Web, Celery and ingest processes each record their own metrics. With
+# PROMETHEUS_MULTIPROC_DIR set (a directory shared by all of them), /metrics
+# aggregates every process; otherwise it shows the serving process only.
+# The crawl and pipeline metrics live in scraper_service/metrics.py.
+
+CELERY_TASK_SECONDS = Histogram(
+    'celery_task_duration_seconds', "Run time of Celery tasks.", ['task', 'state'],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+API_STAGE_SECONDS = Histogram(
+    'api_stage_duration_seconds', "API request time by stage (throttle, query, serialization, total).",
+    ['view', 'stage'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+API_CACHE_REQUESTS = Counter(
+    'api_response_cache_total', "Cacheable API requests by result (hit, miss, not_modified).", ['view', 'result'],
+)
+
+# task id -> start time, for the tasks running in this process
+_task_started = {}
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_SECONDS.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started)
+
+
+@contextmanager
+def api_timer(view, stage):
+    """Records the wall time of the block as one API stage."""
+    with API_STAGE_SECONDS.labels(view, stage).time():
+        yield
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint. Requires 'Authorization: Bearer <METRICS_TOKEN>'; closed while no token is set."""
+    token = settings.METRICS_TOKEN
+    if not token or not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return HttpResponseForbidden()
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
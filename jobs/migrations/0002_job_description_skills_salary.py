@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class AddFieldIfMissing(migrations.AddField):
+    # These fields were in the model long before this migration existed, so
+    # deployed databases usually have the columns already: only add what's missing
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            columns = {column.name for column in connection.introspection.get_table_description(cursor, model._meta.db_table)}
+        if model._meta.get_field(self.name).column not in columns:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        AddFieldIfMissing(
+            model_name='job',
+            name='currency',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        AddFieldIfMissing(
+            model_name='job',
+            name='description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        AddFieldIfMissing(
+            model_name='job',
+            name='salary_max',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        AddFieldIfMissing(
+            model_name='job',
+            name='salary_min',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        AddFieldIfMissing(
+            model_name='job',
+            name='seniority',
+            field=models.CharField(default='Not Specified', max_length=50),
+        ),
+        AddFieldIfMissing(
+            model_name='job',
+            name='skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_description_skills_salary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def fill_search_vectors(apps, schema_editor):
+    # Same document as jobs.search.job_search_vector(); only Postgres has tsvector
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('company', 'skills', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:50
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skills'], name='job_skills_gin'),
+        ),
+    ]
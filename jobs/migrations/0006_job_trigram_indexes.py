@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:51
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    # Opclass expression indexes are Postgres syntax; SQLite (local runs) goes without
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_skills_gin'),
+    ]
+
+    operations = [
+        # pg_trgm provides gin_trgm_ops and the similarity operators (no-op off Postgres)
+        TrigramExtension(),
+        AddPostgresIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='job_title_trgm'),
+        ),
+        AddPostgresIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('company'), name='gin_trgm_ops'), name='job_company_trgm'),
+        ),
+        AddPostgresIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('location'), name='gin_trgm_ops'), name='job_location_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Upper('seniority'), name='job_seniority_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Upper('source'), name='job_source_upper'),
+        ),
+    ]
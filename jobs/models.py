@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 
 class Job(models.Model):
     title = models.CharField(max_length=255)
@@ -14,6 +17,29 @@ class Job(models.Model):
     salary_min = models.IntegerField(null=True, blank=True)
     salary_max = models.IntegerField(null=True, blank=True)
     currency = models.CharField(max_length=10, null=True, blank=True)
+    # Hash of title, company, location and description (see jobs.ingest).
+    # Lets re-crawls skip postings that have not changed.
+    fingerprint = models.CharField(max_length=64, blank=True, default="")
+    # Full-text search document, refreshed on every upsert (see jobs.search).
+    # Only filled on Postgres.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+            # jsonb containment (skills @> '["Python"]') for the skills filter
+            GinIndex(fields=['skills'], name='job_skills_gin'),
+            # Trigrams of UPPER(column): the expression Django emits for icontains
+            # (UPPER(title::text) LIKE UPPER('%x%')), and the fuzzy filters in jobs.search
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='job_title_trgm'),
+            GinIndex(OpClass(Upper('company'), name='gin_trgm_ops'), name='job_company_trgm'),
+            GinIndex(OpClass(Upper('location'), name='gin_trgm_ops'), name='job_location_trgm'),
+            # Case-insensitive equality (iexact) on the short categorical fields
+            models.Index(Upper('seniority'), name='job_seniority_upper'),
+            models.Index(Upper('source'), name='job_source_upper'),
+            # Default ordering of the list, and keyset seeks of the cursor pagination
+            models.Index(fields=['-posted_at', '-id'], name='job_posted_at_id'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
\ No newline at end of file
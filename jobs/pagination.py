@@ -0,0 +1,148 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Stable order of the cursor mode, served by the (posted_at DESC, id DESC) index.
+# Jobs without a date come last (see JobPagination.cursor_page).
+CURSOR_ORDERING = ('-posted_at', '-id')
+
+
+def encode_cursor(row):
+    """Opaque cursor pointing just after `row` (a values() dict): "<posted_at ISO date or empty>|<id>"."""
+    posted_at = row['posted_at'].isoformat() if row['posted_at'] else ''
+    return urlsafe_b64encode(f"{posted_at}|{row['id']}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor(). Returns (posted_at or None, id)."""
+    try:
+        posted_at, job_id = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return (date.fromisoformat(posted_at) if posted_at else None), int(job_id)
+    except (ValueError, UnicodeError):
+        raise NotFound("Invalid cursor.")
+
+
+class JobPagination(PageNumberPagination):
+    """
+    Two modes:
+    - page numbers (default): ?page=N, with the total in "count".
+      ?count=false skips the COUNT(*) over the filtered jobs ("count" is null).
+    - cursor (?cursor= on the first request, then follow "next"): keyset
+      pagination on (posted_at, id). Every page is one index seek however deep
+      it is, and ingest between two requests never shifts or repeats jobs.
+      Always newest first, never counted. Meant for syncing the whole catalogue.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if self.cursor_mode:
+            return self.cursor_page(queryset, request)
+        if request.query_params.get(self.count_query_param, '').lower() in ('false', '0'):
+            return self.uncounted_page(queryset, request)
+        self.counted = True
+        return super().paginate_queryset(queryset, request, view)
+
+    def cursor_page(self, queryset, request):
+        page_size = self.get_page_size(request)
+        raw_cursor = request.query_params[self.cursor_query_param]
+        cursor = decode_cursor(raw_cursor) if raw_cursor else None
+        queryset = queryset.order_by(*CURSOR_ORDERING)
+        undated = queryset.filter(posted_at__isnull=True)
+
+        # Dated and undated jobs are walked separately: each part is one range of
+        # the index, while an "OR posted_at IS NULL" would make Postgres scan from the top.
+        if cursor is None:
+            rows = list(queryset.filter(posted_at__isnull=False)[:page_size + 1])
+        elif cursor[0] is not None:
+            posted_at, job_id = cursor
+            # posted_at <= x bounds the index scan, the OR breaks ties on id
+            after = queryset.filter(posted_at__lte=posted_at).filter(Q(posted_at__lt=posted_at) | Q(id__lt=job_id))
+            rows = list(after[:page_size + 1])
+        else:
+            rows = list(undated.filter(id__lt=cursor[1])[:page_size + 1])
+
+        # Dated jobs ran out on this page: continue with the undated ones
+        if (cursor is None or cursor[0] is not None) and len(rows) <= page_size:
+            rows += list(undated[:page_size + 1 - len(rows)])
+
+        page = rows[:page_size]
+        self.next_cursor = encode_cursor(page[-1]) if len(rows) > page_size else None
+        return page
+
+    def uncounted_page(self, queryset, request):
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = max(int(request.query_params.get(self.page_query_param, 1)), 1)
+        except ValueError:
+            raise NotFound("Invalid page.")
+        self.counted = False
+
+        # One extra row tells whether there is a next page
+        start = (self.page_number - 1) * page_size
+        rows = list(queryset[start:start + page_size + 1])
+        # Same as the counted mode: past the last page is a 404, not an empty page
+        if self.page_number > 1 and not rows:
+            raise NotFound("Invalid page.")
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.cursor_mode:
+            if self.next_cursor is None:
+                return None
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+        if self.counted:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.cursor_mode:
+            return None  # forward only
+        if self.counted:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count if not self.cursor_mode and self.counted else None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.cursor_query_param, 'required': False, 'in': 'query',
+                'description': "Cursor mode: empty for the first page, then the value from \"next\".",
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param, 'required': False, 'in': 'query',
+                'description': "false skips the total count (faster).",
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        return response_schema
@@ -0,0 +1,51 @@
+import csv
+import io
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson: the same compact UTF-8 output, several times faster
+    on large pages. Types orjson doesn't know (lazy strings, Decimal...) go
+    through DRF's encoder. Indented output (?format=json; indent=4) stays on DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=self.encoder_class().default)
+
+
+# Content negotiation of the export endpoint (?format=ndjson|csv or the Accept header).
+# The rows themselves are streamed by the view (see jobs.export); these only
+# render what goes through DRF, i.e. error responses.
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=JSONRenderer.encoder_class().default) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # Errors are flat dicts: {"detail": "..."} or {"field": ["message"]}
+        items = data.items() if isinstance(data, dict) else [('detail', data)]
+        writer.writerows((key, '; '.join(map(str, value)) if isinstance(value, list) else value) for key, value in items)
+        return buffer.getvalue().encode(self.charset)
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import parse_etags
+
+logger = logging.getLogger(__name__)
+
+# Version of the job dataset. Every write that changes the jobs bumps it, which
+# makes all cached list responses unreachable at once (they expire on their own).
+JOBS_GENERATION_KEY = "jobs:generation"
+
+
+def jobs_generation():
+    generation = cache.get(JOBS_GENERATION_KEY)
+    if generation is None:
+        # Start from the clock, not 0: keys and ETags handed out before the cache
+        # was emptied must not come back for different data
+        cache.add(JOBS_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(JOBS_GENERATION_KEY)
+    return generation
+
+
+def bump_jobs_generation():
+    """Invalidates the cached job lists once the current transaction commits (right away outside one)."""
+    transaction.on_commit(_bump)
+
+
+def _bump():
+    try:
+        try:
+            cache.incr(JOBS_GENERATION_KEY)
+        except ValueError:
+            # First write since the cache was emptied
+            cache.add(JOBS_GENERATION_KEY, time.time_ns(), timeout=None)
+    except redis.RedisError as e:
+        # Cached lists may then be served until JOBS_CACHE_TTL expires them
+        logger.warning("Could not invalidate the job list cache: %s", e)
+
+
+def list_cache_key(request):
+    """
+    Cache key of a list response: dataset generation + everything the body depends on.
+    Parameters are normalized (sorted, repeated values kept in order), so
+    ?skills=Python&seniority=Senior and ?seniority=Senior&skills=Python share an entry.
+    Host and scheme are included because the next/previous links are absolute.
+    Returns None if the cache is unavailable.
+    """
+    try:
+        generation = jobs_generation()
+    except redis.RedisError as e:
+        logger.warning("Job list cache unavailable: %s", e)
+        return None
+    params = sorted((name, request.query_params.getlist(name)) for name in request.query_params)
+    raw = repr((request.scheme, request.get_host(), request.path, request.accepted_media_type, params))
+    return f"jobs:list:{generation}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def list_etag(cache_key):
+    """Validator of a list response: the same inputs as its cache key, so it changes with every write."""
+    return '"%s"' % hashlib.sha1(cache_key.encode()).hexdigest()
+
+
+def etag_matches(request, etag):
+    """If-None-Match check. Weak comparison: proxies that compress the body turn the ETag into W/"..."."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = {tag.removeprefix('W/') for tag in parse_etags(header)}
+    return etag in etags or '*' in etags
+
+
+def get_cached(key):
+    try:
+        return cache.get(key)
+    except redis.RedisError as e:
+        logger.warning("Job list cache unavailable: %s", e)
+        return None
+
+
+def set_cached(key, content):
+    try:
+        cache.set(key, content, settings.JOBS_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning("Job list cache unavailable: %s", e)
@@ -0,0 +1,97 @@
+import json
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Upper
+from scraper_service.constants import TECH_KEYWORDS
+
+# Text search configuration (stemming, stop words) for vectors and queries
+SEARCH_CONFIG = 'english'
+
+# Stored skills are the canonical TECH_KEYWORDS spellings ('python' -> 'Python')
+CANONICAL_SKILLS = {skill.lower(): skill for skill in TECH_KEYWORDS}
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def job_search_vector(row):
+    """
+    Weighted document of a job: title first, then company and skills, then description.
+    Built from the values about to be written (a dict of Job field values), so the
+    upsert stores it in the same INSERT ... ON CONFLICT statement.
+    """
+    title, company, description = (
+        Value(row.get(name), output_field=TextField()) for name in ('title', 'company', 'description')
+    )
+    # Same text as the jsonb column cast to text: ["Python", "Django"]
+    skills = Value(json.dumps(row.get('skills') or [], ensure_ascii=False), output_field=TextField())
+    return (
+        SearchVector(title, weight='A', config=SEARCH_CONFIG)
+        + SearchVector(company, skills, weight='B', config=SEARCH_CONFIG)
+        + SearchVector(description, weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def search_jobs(queryset, text):
+    """
+    Full-text search over title, company, skills and description, best matches first.
+    Uses the GIN-indexed search_vector on Postgres. Other databases (SQLite for
+    local runs) fall back to unranked substring matching on the same fields.
+    """
+    if is_postgres():
+        # websearch syntax: "exact phrase", -excluded, OR
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', '-posted_at', '-id')
+        )
+
+    return queryset.filter(
+        Q(title__icontains=text) | Q(company__icontains=text)
+        | Q(skills__icontains=text) | Q(description__icontains=text)
+    )
+
+
+def filter_skills(queryset, skills, match_all=True):
+    """
+    Jobs having all (match_all) or any of the given skills, case-insensitive.
+    On Postgres this is jsonb containment (skills @> '["Python"]'), served by the
+    GIN index on skills. Other databases match the quoted name in the JSON text.
+    """
+    skills = [CANONICAL_SKILLS.get(skill.lower(), skill) for skill in skills]
+    if not skills:
+        return queryset
+
+    if is_postgres():
+        if match_all:
+            return queryset.filter(skills__contains=skills)
+        condition = Q()
+        for skill in skills:
+            condition |= Q(skills__contains=[skill])
+        return queryset.filter(condition)
+
+    # Quotes: "Java" matches "Java" but NOT "JavaScript"
+    conditions = [Q(skills__iregex=f'"{re.escape(skill)}"') for skill in skills]
+    condition = conditions[0]
+    for other in conditions[1:]:
+        condition = condition & other if match_all else condition | other
+    return queryset.filter(condition)
+
+
+def filter_text(queryset, field, value, fuzzy=False):
+    """
+    Substring filter on a text column, case-insensitive. Both modes are served by the
+    trigram index on UPPER(field). With fuzzy, on Postgres, the value only has to be
+    similar to part of the column (pg_trgm word similarity), so typos still match:
+    "pyhton" finds "Python Developer".
+    """
+    if fuzzy and is_postgres():
+        # Same expression as the index; trigrams themselves ignore case
+        return queryset.alias(**{f'{field}_upper': Upper(field)}).filter(
+            **{f'{field}_upper__trigram_word_similar': value}
+        )
+    return queryset.filter(**{f'{field}__icontains': value})
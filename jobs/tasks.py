@@ -1,35 +1,146 @@
-from celery import shared_task
-import subprocess
+import hashlib
+import logging
+import re
+import uuid
+from celery import shared_task, chord
 from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
 from django.utils import timezone
 from .models import Job
+from .crawler import run_crawls
+from .response_cache import bump_jobs_generation
+
+logger = logging.getLogger(__name__)
+
+# States of an on-demand scrape. SCRAPE_STARTED is only returned by start_scrape(),
+# to the caller that started the crawl.
+SCRAPE_STARTED = "started"
+SCRAPE_RUNNING = "running"
+SCRAPE_DONE = "done"
+SCRAPE_FAILED = "failed"
+
+
+def describe(result):
+    """Short summary of one crawl result, e.g. 'wwr: 42 items'."""
+    label = result['spider']
+    if result['kwargs']:
+        label += f" ({', '.join(str(v) for v in result['kwargs'].values())})"
+    if result['finish_reason'] != 'finished':
+        return f"{label}: {result['finish_reason']}"
+    return f"{label}: {result['items']} items"
+
+
+def scrape_key(keyword, location):
+    """Cache key of an on-demand scrape; 'Python ' and 'python' are the same search."""
+    normalized = f"{' '.join(keyword.split())}\x1f{' '.join(location.split())}".casefold()
+    return f"scrape:{hashlib.sha1(normalized.encode()).hexdigest()}"
+
+
+def scrape_record(scrape_id):
+    """
+    Status of an on-demand scrape, or None once it expired (SCRAPE_STATUS_TTL):
+    {id, keyword, location, status, started_at, finished_at, new_jobs}
+    """
+    return cache.get(f"scrape:job:{scrape_id}")
+
+
+def save_scrape_record(record, timeout):
+    cache.set(f"scrape:job:{record['id']}", record, timeout=timeout)
+
+
+def start_scrape(keyword, location):
+    """
+    Single-flight entry point for on-demand scrapes.
+    Starts run_scrapers unless the same (keyword, location) is already being scraped
+    or was scraped less than SCRAPE_COOLDOWN seconds ago; those callers get the
+    record of that scrape instead.
+    Returns (status, record), status being SCRAPE_STARTED or the record's status.
+    """
+    key = scrape_key(keyword, location)
+    record = {
+        'id': str(uuid.uuid4()),
+        'keyword': keyword,
+        'location': location,
+        'status': SCRAPE_RUNNING,
+        'started_at': timezone.now().isoformat(),
+        'finished_at': None,
+        'new_jobs': None,
+    }
+    # Saved before the lock is taken, so whoever sees the lock finds the record
+    save_scrape_record(record, timeout=settings.SCRAPE_LOCK_TIMEOUT)
+
+    # cache.add is atomic: only one caller gets the lock
+    if not cache.add(key, record['id'], timeout=settings.SCRAPE_LOCK_TIMEOUT):
+        cache.delete(f"scrape:job:{record['id']}")
+        scrape_id = cache.get(key)
+        current = scrape_record(scrape_id) if scrape_id else None
+        if current is None:
+            # Lock expired meanwhile: report it as running rather than retrying
+            return SCRAPE_RUNNING, {**record, 'id': scrape_id}
+        return current['status'], current
+
+    try:
+        run_scrapers.delay(keyword=keyword, location=location, scrape_id=record['id'])
+    except Exception:
+        # Broker down: don't block the next caller
+        cache.delete(key)
+        raise
+    return SCRAPE_STARTED, record
+
+
+def count_new_jobs(keyword, since):
+    """Jobs first stored since `since` that a search for `keyword` returns (title or skill)."""
+    return Job.objects.filter(created_at__gte=since).filter(
+        Q(title__icontains=keyword) | Q(skills__iregex=f'"{re.escape(keyword)}"')
+    ).count()
 
 
 @shared_task
-def run_scrapers(keyword='Python', location='Europe'):
+def run_scrapers(keyword='Python', location='Europe', scrape_id=None):
     """
     On-Demand Task: Triggered when a user clicks 'Search' or 'Scrape'.
     Runs LinkedIn for the specific keyword AND grabs the latest WWR feed.
+    Start it through start_scrape() so identical requests share one crawl
+    and clients can follow it (scrape_record).
     """
-    results = []
+    record = scrape_record(scrape_id) if scrape_id else None
+    started_at = timezone.now()
+    status = SCRAPE_FAILED
+
+    # WWR (RSS, ~2 seconds) and LinkedIn (targeted search, 20-30 seconds)
+    # hit different sites, so they crawl side by side.
+    logger.info("On-demand scrape (WWR + LinkedIn) for %r in %r", keyword, location)
+    try:
+        results = run_crawls([
+            ("wwr", {}),
+            ("linkedin", {"keyword": keyword, "location": location}),
+        ], concurrency=2)
+        status = SCRAPE_DONE
+    finally:
+        if record is not None:
+            record.update(
+                status=status,
+                finished_at=timezone.now().isoformat(),
+                new_jobs=count_new_jobs(keyword, started_at) if status == SCRAPE_DONE else 0,
+            )
+            save_scrape_record(record, timeout=settings.SCRAPE_STATUS_TTL)
+            # Failed crawls cool down too, so a broken search isn't retried in a loop
+            cache.set(scrape_key(keyword, location), scrape_id, timeout=settings.SCRAPE_COOLDOWN)
+
+    return f"Scraping Finished. Sources: {', '.join(describe(r) for r in results)}"
 
-    # 1. Run We Work Remotely (Fast & Reliable - 2 seconds)
-    print(f"🚀 [On-Demand] Starting WWR Scrape...")
-    subprocess.run([
-        "scrapy", "crawl", "wwr"
-    ], cwd="/app/scraper_service")
-    results.append("WWR")
 
-    # 2. Run LinkedIn (Targeted Search - 20-30 seconds)
-    print(f"🔎 [On-Demand] Starting LinkedIn Scrape for {keyword}...")
-    subprocess.run([
-        "scrapy", "crawl", "linkedin",
-        "-a", f"keyword={keyword}",
-        "-a", f"location={location}"
-    ], cwd="/app/scraper_service")
-    results.append("LinkedIn")
-
-    return f"Scraping Finished. Sources: {', '.join(results)}"
+@shared_task
+def run_crawl(spider, **kwargs):
+    """
+    Unit Task: One spider run (e.g. LinkedIn for one keyword/region pair).
+    Units run in parallel across Celery workers; LinkedIn requests still go
+    through the shared per-domain rate limiter (SHARED_RATE_LIMITS).
+    Items go through the ingest worker by default (see BULK_SCRAPE_INGEST_MODE).
+    """
+    return run_crawls([(spider, kwargs)], ingest_mode=settings.BULK_SCRAPE_INGEST_MODE)[0]
 
 
 @shared_task
@@ -37,20 +148,12 @@ def run_bulk_scrape():
     """
     Scheduled Task: Runs periodically (e.g., every 6 hours).
     Populates the database with a wide variety of jobs from ALL sources.
+    Fans the sweep out as independent crawl units; summarize_bulk_scrape
+    reports the totals once all of them are done.
     """
-    results = []
-
-    # --- PART 1: We Work Remotely (The Safety Net) ---
-    # This is an RSS feed, so it's very fast and safe to run often.
-    print("🚀 [Bulk] Starting WeWorkRemotely Scrape...")
-    subprocess.run([
-        "scrapy", "crawl", "wwr"
-    ], cwd="/app/scraper_service")
-    results.append("WeWorkRemotely")
-
-    # Inside run_bulk_scrape
-    subprocess.run(["scrapy", "crawl", "remoteok"], cwd="/app/scraper_service")
-    results.append("RemoteOK")
+    # --- PART 1: RSS feeds (The Safety Net) ---
+    # We Work Remotely and RemoteOK are fast and safe to run often.
+    units = [run_crawl.s("wwr"), run_crawl.s("remoteok")]
 
     # --- PART 2: LinkedIn (The Heavy Lifter) ---
     # We loop through popular keywords to build a rich database.
@@ -58,21 +161,33 @@ def run_bulk_scrape():
     tech_stack = ["Python", "JavaScript", "React", "DevOps", "Data", "C++", "C#", ".NET", "Java", "PHP"]
     regions = ["Remote", "Europe", "United States", "United Kingdom", "Australia", "Canada"]
 
-    for tech in tech_stack:
-        for region in regions:
-            print(f"🔎 [Bulk] LinkedIn Scrape: {tech} - {region}")
+    units += [
+        run_crawl.s("linkedin", keyword=tech, location=region)
+        for tech in tech_stack
+        for region in regions
+    ]
+
+    logger.info("Bulk scrape: dispatching %d crawl units", len(units))
+    result = chord(units)(summarize_bulk_scrape.s())
+
+    return f"Bulk Scrape Started. {len(units)} units, summary task {result.id}"
 
-            # We wait for each process to finish before starting the next
-            # This acts as a natural rate-limiter.
-            subprocess.run([
-                "scrapy", "crawl", "linkedin",
-                "-a", f"keyword={tech}",
-                "-a", f"location={region}"
-            ], cwd="/app/scraper_service")
 
-            results.append(f"LI:{tech}-{region}")
+@shared_task
+def summarize_bulk_scrape(results):
+    """
+    Chord Callback: Runs once every unit of a bulk sweep has finished.
+    """
+    items = sum(r['items'] for r in results)
+    failed = [describe(r) for r in results if r['finish_reason'] != 'finished']
 
-    return f"Bulk Scrape Complete. Covered: {', '.join(results)}"
+    report = f"Bulk Scrape Complete. {len(results)} crawls, {items} items scraped."
+    if failed:
+        report += f" Failed: {', '.join(failed)}"
+        logger.warning(report)
+    else:
+        logger.info(report)
+    return report
 
 
 @shared_task
@@ -85,5 +200,7 @@ def cleanup_old_jobs():
 
     # The _ is strictly standard variable naming for "ignored return value"
     deleted_count, _ = Job.objects.filter(posted_at__lt=cutoff_date).delete()
+    if deleted_count:
+        bump_jobs_generation()
 
     return f"Janitor Report: Deleted {deleted_count} jobs older than {cutoff_date}"
\ No newline at end of file
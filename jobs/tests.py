@@ -1,3 +1,627 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework_api_key.models import APIKey
+from scraper_service.utils import extract_skills, parse_salary
+
+from .ingest import job_row, upsert_jobs
+from .models import Job
+from .response_cache import JOBS_GENERATION_KEY, jobs_generation
+from .search import filter_skills
+from .tasks import (
+    SCRAPE_DONE, SCRAPE_FAILED, SCRAPE_RUNNING, SCRAPE_STARTED, cleanup_old_jobs, run_scrapers, save_scrape_record,
+    scrape_record, start_scrape,
+)
+from .serializers import JobSerializer
+from .views import JobDetailAPI, JobListAPI, ScrapeStatusAPI
+
+# The tests run without Redis
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Golden corpus: outputs of the original (one regex per keyword) extract_skills.
+# The optimized matcher must keep returning exactly these, in TECH_KEYWORDS order.
+SKILL_CASES = [
+    ('', []),
+    ('Senior Python Developer. We use Django, PostgreSQL and Docker on AWS.', ['Python', 'Django', 'PostgreSQL', 'AWS', 'Docker']),
+    ('python, DJANGO and react; some Kubernetes.', ['Python', 'Django', 'React', 'Kubernetes']),
+    ('Java developer wanted. JavaScript is not used here.', ['JavaScript', 'Java']),
+    ('We write JavaScript and TypeScript, no Java.', ['JavaScript', 'TypeScript', 'Java']),
+    ('Experience with C++ and C# required, .NET Core is a plus.', []),
+    ('Go (Golang) engineer. Rust would be an asset.', []),
+    ('No experience with Rust needed... but we love Go.', []),
+    ('Knowledge of R and Julia for statistics. Python not required.', []),
+    ('Node.js, Next.js, Vue.js and Nuxt.js frontend stack.', ['Vue.js', 'Next.js', 'Nuxt.js', 'Node.js']),
+    ('Ruby on Rails, Ruby and PHP (Laravel, Symfony).', ['Ruby', 'PHP', 'Laravel', 'Symfony', 'Ruby on Rails']),
+    ('React Native and Flutter for mobile, SwiftUI for iOS, Jetpack Compose for Android.', ['React', 'React Native', 'Flutter', 'Android', 'iOS', 'SwiftUI', 'Jetpack Compose']),
+    ('Our CI/CD runs on GitHub Actions and GitLab CI; code lives on GitHub and GitLab.', ['GitLab CI', 'GitHub Actions', 'GitHub', 'GitLab', 'CI/CD']),
+    ('Machine Learning, Deep Learning and NLP with PyTorch, TensorFlow and Hugging Face.', ['Machine Learning', 'Deep Learning', 'NLP', 'TensorFlow', 'PyTorch', 'Hugging Face']),
+    ('Data Science stack: Pandas, NumPy, Scikit-learn, Matplotlib, Seaborn.', ['Data Science', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib', 'Seaborn']),
+    ('Spark and Hadoop on Databricks; Airflow orchestrates, Snowflake and BigQuery store.', ['Spark', 'Hadoop', 'Airflow', 'Databricks', 'Snowflake', 'BigQuery']),
+    ('Agile/Scrum team using Jira, Confluence and Slack. TDD and BDD practices.', ['Jira', 'Confluence', 'Slack', 'Agile', 'Scrum', 'TDD', 'BDD']),
+    ('REST API and GraphQL services, gRPC internally, WebSockets for realtime.', ['REST API', 'GraphQL', 'gRPC', 'WebSockets']),
+    ('Microservices on Kubernetes, Serverless on Azure and GCP (Google Cloud).', ['Azure', 'GCP', 'Google Cloud', 'Kubernetes', 'Microservices', 'Serverless']),
+    ('Terraform, Ansible, Puppet and Chef. Jenkins, CircleCI, Travis CI.', ['Terraform', 'Ansible', 'Jenkins', 'CircleCI', 'Travis CI', 'Puppet', 'Chef']),
+    ('Monitoring: Prometheus, Grafana, Datadog, New Relic, Splunk, ELK Stack.', ['Prometheus', 'Grafana', 'Datadog', 'New Relic', 'Splunk', 'ELK Stack']),
+    ('Linux (Ubuntu, CentOS) and Unix admin, Bash and Shell scripting, PowerShell too.', ['Bash', 'Shell', 'PowerShell', 'Linux', 'Unix', 'Ubuntu', 'CentOS']),
+    ('Databases: MySQL, MariaDB, MongoDB, Redis, Elasticsearch, Cassandra, SQLite, DynamoDB.', ['MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'Cassandra', 'MariaDB', 'SQLite', 'DynamoDB']),
+    ('Cosmos DB, Neo4j, Oracle, SQL Server, Firebase and Supabase.', ['SQL', 'Cosmos DB', 'Neo4j', 'Oracle', 'SQL Server', 'Firebase', 'Supabase']),
+    ('HTML, CSS, Sass and Less with Bootstrap, Tailwind CSS and jQuery.', ['HTML', 'CSS', 'Sass', 'Less', 'jQuery', 'Bootstrap', 'Tailwind CSS']),
+    ('Spring Boot, ASP.NET, Express and NestJS backends; FastAPI and Flask in Python.', ['Python', 'Flask', 'FastAPI', 'Express', 'NestJS', 'Spring Boot', 'ASP.NET']),
+    ('Swift, Kotlin, Dart, Scala, Elixir (Phoenix), Haskell, Lua, Perl.', ['Swift', 'Kotlin', 'Dart', 'Scala', 'Elixir', 'Haskell', 'Lua', 'Perl', 'Phoenix']),
+    ('Kubernetes knowledge is advantageous. Docker is desirable but not essential.', []),
+    ("We don't need Java skills. Python experience is mandatory.", []),
+    ('Python xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx no experience with Python required yyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyy Python again', ['Python']),
+    ('LLM and Generative AI, Computer Vision with OpenCV, Artificial Intelligence research.', ['Artificial Intelligence', 'Computer Vision', 'OpenCV', 'LLM', 'Generative AI']),
+    ('Tableau and Power BI dashboards on Redshift; Keras models.', ['Keras', 'Redshift', 'Tableau', 'Power BI']),
+    ('Tools: Git, Bitbucket, Trello, Asana, Kanban boards.', ['Git', 'Bitbucket', 'Trello', 'Asana', 'Kanban']),
+    ('Nginx and Apache web servers, Xamarin and Ionic apps.', ['Xamarin', 'Ionic', 'Nginx', 'Apache']),
+    ('Gopher? Going to Golang meetups. Rusty. Javascripting. Pythonic.', []),
+    ('SQL and PL/SQL, NoSQL, MySQL8, postgres.', ['SQL']),
+    ('<p>Requirements:</p><ul><li>Python</li><li>Django</li><li>AWS</li></ul>', ['Python', 'Django', 'AWS']),
+    ('C++17 and C#10; .NET 8 and ASP.NET MVC', ['C++', 'C#', 'ASP.NET']),
+    ('Without experience in React? No problem: no prior experience in Angular or Svelte either.', []),
+    ('Experience with GraphQL is a plus', []),
+]
+
+# Golden corpus: outputs of the original parse_salary, quirks included
+# ("$80-100k per year" is rejected: "year" is an ignore term).
+SALARY_CASES = [
+    ('', (None, None, None)),
+    ('Salary: $80-100k per year', (None, None, None)),
+    ('Compensation 80k - 120k', (80000, 120000, 'USD')),
+    ('€4000-5000 per month', (None, None, None)),
+    ('4000-5000/month gross', (None, None, None)),
+    ('We pay $50 per hour', (None, None, None)),
+    ('Rate: 400 per day, remote', (None, None, None)),
+    ('Salary range: 60,000 - 80,000 EUR annually', (60000, 80000, 'EUR')),
+    ('£45,000 base plus bonus', (45000, 45000, 'GBP')),
+    ('Join 250,000 users and 300 employees worldwide', (None, None, None)),
+    ('Salary 70k. We serve 1,000,000 customers.', (None, None, None)),
+    ('Pay: 3500 monthly', (42000, 42000, 'USD')),
+    ('BGN 3000 per month', (None, None, None)),
+    ('Work 40 hours per week, 25 days holiday', (None, None, None)),
+    ('OTE 120k, base 90k', (90000, 120000, 'USD')),
+    ('Up to $150k + equity', (150000, 150000, 'USD')),
+    ('Remuneration: 55.000 EUR p.a.', (55000, 55000, 'EUR')),
+    ('Earnings 2500 p.m.', (30000, 30000, 'USD')),
+    ('Hourly pay 60/hr', (124800, 124800, 'USD')),
+    ('Package 100k to 140k', (100000, 140000, 'USD')),
+    ('We are 50 people in 3 offices across 12 countries', (None, None, None)),
+    ('Salary: 10 000 per year', (None, None, None)),
+    ('salary 1200000', (None, None, None)),
+    ('$95,000-$110,000', (95000, 110000, 'USD')),
+    ('Salary: 90k-110k GBP', (90000, 110000, 'GBP')),
+    ('Founded in 2015, 2 years of experience required. Salary competitive.', (None, None, None)),
+    ('Compensation: 85000 yearly; 4 weeks vacation', (None, None, None)),
+    ('Earn 30 - 40 per hour', (None, None, None)),
+    ('Base salary 5k monthly', (60000, 60000, 'USD')),
+    ('No numbers here at all', (None, None, None)),
+]
+
+
+class ExtractSkillsTests(SimpleTestCase):
+    def test_golden_corpus(self):
+        for text, expected in SKILL_CASES:
+            with self.subTest(text=text):
+                self.assertEqual(extract_skills(text), expected)
+
+    def test_none(self):
+        self.assertEqual(extract_skills(None), [])
+
+
+class ParseSalaryTests(SimpleTestCase):
+    def test_golden_corpus(self):
+        for text, expected in SALARY_CASES:
+            with self.subTest(text=text):
+                self.assertEqual(parse_salary(text), expected)
+
+    def test_none(self):
+        self.assertEqual(parse_salary(None), (None, None, None))
+
+
+def make_job(n, posted_at=None, **fields):
+    return Job.objects.create(
+        title=f"Job {n}", company="Acme", url=f"https://example.com/jobs/{n}", source="Test",
+        posted_at=posted_at, **fields,
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JobListTestCase(TestCase):
+    """GET /api/jobs/ without throttling, on an empty local cache."""
+
+    url = reverse('job-list')
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(JobListAPI, 'throttle_classes', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def walk(self, url):
+        """Ids of every job reached by following "next" from url."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            ids += [job['id'] for job in body['results']]
+            url = body['next']
+        return ids
+
+
+class JobPaginationTests(JobListTestCase):
+    def setUp(self):
+        super().setUp()
+        newer, older = date(2026, 3, 2), date(2026, 3, 1)
+        # Several jobs per date (ties are broken on id), and undated ones
+        self.jobs = [make_job(n, posted_at) for n, posted_at in enumerate([older, newer, older, None, newer, None, older])]
+
+    def cursor_order(self):
+        """Newest first, ties on the highest id, undated jobs last."""
+        dated = sorted((job for job in self.jobs if job.posted_at), key=lambda job: (job.posted_at, job.id), reverse=True)
+        undated = sorted((job.id for job in self.jobs if not job.posted_at), reverse=True)
+        return [job.id for job in dated] + undated
+
+    def test_cursor_walks_every_job_once(self):
+        for page_size in (1, 2, 3, 5, 100):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.walk(f"{self.url}?cursor=&page_size={page_size}"), self.cursor_order())
+
+    def test_cursor_page(self):
+        body = self.client.get(f"{self.url}?cursor=&page_size=2").json()
+        self.assertIsNone(body['count'])
+        self.assertIsNone(body['previous'])
+        self.assertIn('cursor=', body['next'])
+
+    def test_cursor_ignores_jobs_added_between_pages(self):
+        body = self.client.get(f"{self.url}?cursor=&page_size=3").json()
+        seen = [job['id'] for job in body['results']]
+        make_job('new', date(2026, 3, 3))
+        self.assertEqual(seen + self.walk(body['next']), self.cursor_order())
+
+    def test_cursor_filters(self):
+        self.assertEqual(
+            self.walk(f"{self.url}?cursor=&page_size=1&company=acme"),
+            self.walk(f"{self.url}?cursor=&page_size=1"),
+        )
+        self.assertEqual(self.walk(f"{self.url}?cursor=&company=nobody"), [])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(f"{self.url}?cursor=garbage").status_code, 404)
+
+    def test_uncounted_pages(self):
+        body = self.client.get(f"{self.url}?count=false&page_size=3").json()
+        self.assertIsNone(body['count'])
+        self.assertIsNone(body['previous'])
+        # Same pages as the counted mode, without the total
+        self.assertEqual(
+            self.walk(f"{self.url}?count=false&page_size=3"),
+            self.walk(f"{self.url}?page_size=3"),
+        )
+        self.assertEqual(self.client.get(f"{self.url}?page_size=3").json()['count'], len(self.jobs))
+
+    def test_uncounted_previous_link(self):
+        body = self.client.get(f"{self.url}?count=false&page_size=3&page=3").json()
+        self.assertEqual(len(body['results']), 1)
+        self.assertIsNone(body['next'])
+        self.assertIn('page=2', body['previous'])
+
+    @mock.patch('jobs.views.start_scrape')
+    def test_past_the_last_page(self, start_scrape):
+        for params in ("count=false&page=4", "page=4", "count=false&page=99&skills=Python"):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(f"{self.url}?page_size=3&{params}").status_code, 404)
+        start_scrape.assert_not_called()
+
+
+class JobListCacheTests(JobListTestCase):
+    def setUp(self):
+        super().setUp()
+        make_job(1, date.today(), seniority="Senior")
+
+    def test_repeated_request_skips_the_db(self):
+        first = self.client.get(f"{self.url}?seniority=senior&page_size=5")
+        with self.assertNumQueries(0):
+            second = self.client.get(f"{self.url}?page_size=5&seniority=senior")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+
+    def test_other_parameters_miss(self):
+        self.client.get(f"{self.url}?seniority=senior")
+        with self.assertNumQueries(2):  # count + page
+            self.client.get(f"{self.url}?seniority=senior&page_size=5")
+
+    def test_upsert_invalidates(self):
+        self.assertEqual(self.client.get(self.url).json()['count'], 1)
+        generation = jobs_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_jobs([job_row({'url': "https://example.com/jobs/2", 'title': "Job 2", 'company': "Acme", 'source': "Test"})])
+        self.assertGreater(jobs_generation(), generation)
+        self.assertEqual(self.client.get(self.url).json()['count'], 2)
+
+    def test_cleanup_invalidates(self):
+        make_job('old', date.today() - timedelta(days=60))
+        self.assertEqual(self.client.get(self.url).json()['count'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            cleanup_old_jobs()
+        self.assertEqual(self.client.get(self.url).json()['count'], 1)
+
+    def test_cleanup_without_deletions_keeps_the_cache(self):
+        self.client.get(self.url)
+        generation = jobs_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            cleanup_old_jobs()
+        self.assertEqual(jobs_generation(), generation)
+
+    def test_generation_survives_an_emptied_cache(self):
+        generation = jobs_generation()
+        cache.delete(JOBS_GENERATION_KEY)
+        # Restarts from the clock, never from an older value
+        self.assertGreater(jobs_generation(), generation)
+
+    @mock.patch('jobs.views.start_scrape', return_value=(SCRAPE_STARTED, {'id': "7a0c8e4e-4a5f-4a0e-9a51-0d4a6f5c2b11"}))
+    def test_misses_that_start_a_scrape_are_not_cached(self, start_scrape):
+        for _ in range(2):
+            body = self.client.get(f"{self.url}?skills=Cobol").json()
+            self.assertEqual(body['scrape_status'], SCRAPE_STARTED)
+        self.assertEqual(start_scrape.call_count, 2)
+
+
+class JobListETagTests(JobListTestCase):
+    def setUp(self):
+        super().setUp()
+        make_job(1, date.today())
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertTrue(etag)
+        for header in (etag, f"W/{etag}", f'"other", {etag}', '*'):
+            with self.subTest(header=header), self.assertNumQueries(0):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(response.content, b'')
+
+    def test_cached_response_keeps_its_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url)['ETag'], etag)
+
+    def test_stale_etag(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_jobs([job_row({'url': "https://example.com/jobs/2", 'title': "Job 2", 'company': "Acme", 'source': "Test"})])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_the_parameters(self):
+        self.assertNotEqual(self.client.get(self.url)['ETag'], self.client.get(f"{self.url}?page_size=5")['ETag'])
+
+    def test_browsable_api_has_no_etag(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class FilterSkillsTests(JobListTestCase):
+    def setUp(self):
+        super().setUp()
+        self.python = make_job('python', skills=["Python", "Django"])
+        self.java = make_job('java', skills=["Java"])
+        self.javascript = make_job('javascript', skills=["JavaScript", "React"])
+        self.both = make_job('both', skills=["Python", "Java"])
+        self.none = make_job('none')
+
+    def matching(self, skills, match_all=True):
+        return set(filter_skills(Job.objects.all(), skills, match_all=match_all))
+
+    def test_all(self):
+        self.assertEqual(self.matching(["Python"]), {self.python, self.both})
+        self.assertEqual(self.matching(["Python", "Java"]), {self.both})
+        self.assertEqual(self.matching(["Python", "React"]), set())
+
+    def test_any(self):
+        self.assertEqual(self.matching(["Django", "Java"], match_all=False), {self.python, self.java, self.both})
+        self.assertEqual(self.matching(["Cobol", "React"], match_all=False), {self.javascript})
+
+    def test_whole_skill_names(self):
+        # "Java" is not a prefix match of "JavaScript"
+        self.assertEqual(self.matching(["Java"]), {self.java, self.both})
+        self.assertEqual(self.matching(["JavaScript"]), {self.javascript})
+
+    def test_any_case(self):
+        self.assertEqual(self.matching(["python", "JAVA"]), {self.both})
+
+    def test_no_skills(self):
+        self.assertEqual(self.matching([]), set(Job.objects.all()))
+
+    def test_list_parameters(self):
+        def titles(params):
+            return {job['title'] for job in self.client.get(f"{self.url}?{params}").json()['results']}
+
+        self.assertEqual(titles("skills=python, java"), {"Job both"})
+        self.assertEqual(titles("skills=python,java&skills_match=any"), {"Job python", "Job java", "Job both"})
+        self.assertEqual(titles("skills=Python,,&skills_match=all"), {"Job python", "Job both"})
+        self.assertEqual(self.client.get(f"{self.url}?skills=Python&skills_match=some").status_code, 400)
+
+
+def crawl_result(spider, items=1):
+    return {'spider': spider, 'kwargs': {}, 'items': items, 'finish_reason': 'finished'}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StartScrapeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('jobs.tasks.run_scrapers.delay')
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_start(self):
+        status, record = start_scrape("Python", "Europe")
+        self.assertEqual(status, SCRAPE_STARTED)
+        self.assertEqual(record['status'], SCRAPE_RUNNING)
+        self.assertEqual(scrape_record(record['id']), record)
+        self.delay.assert_called_once_with(keyword="Python", location="Europe", scrape_id=record['id'])
+
+    def test_identical_searches_share_one_crawl(self):
+        _, first = start_scrape("Python", "Europe")
+        status, record = start_scrape(" python ", "EUROPE")
+        self.assertEqual(status, SCRAPE_RUNNING)
+        self.assertEqual(record['id'], first['id'])
+        self.delay.assert_called_once()
+
+    def test_other_searches_start_their_own_crawl(self):
+        start_scrape("Python", "Europe")
+        self.assertEqual(start_scrape("Python", "Remote")[0], SCRAPE_STARTED)
+        self.assertEqual(start_scrape("Rust", "Europe")[0], SCRAPE_STARTED)
+        self.assertEqual(self.delay.call_count, 3)
+
+    def test_done_search_cools_down(self):
+        _, record = start_scrape("Python", "Europe")
+
+        def crawl(crawls, concurrency):
+            make_job("python-developer")
+            return [crawl_result('wwr'), crawl_result('linkedin')]
+
+        with mock.patch('jobs.tasks.run_crawls', side_effect=crawl):
+            run_scrapers(keyword="Python", location="Europe", scrape_id=record['id'])
+
+        status, done = start_scrape("Python", "Europe")
+        self.assertEqual(status, SCRAPE_DONE)
+        self.assertEqual(done['id'], record['id'])
+        self.assertEqual(done['new_jobs'], 1)
+        self.assertIsNotNone(done['finished_at'])
+        self.delay.assert_called_once()
+
+    def test_failed_search_cools_down(self):
+        _, record = start_scrape("Python", "Europe")
+        with mock.patch('jobs.tasks.run_crawls', side_effect=RuntimeError("reactor died")), \
+                self.assertRaises(RuntimeError):
+            run_scrapers(keyword="Python", location="Europe", scrape_id=record['id'])
+
+        status, failed = start_scrape("Python", "Europe")
+        self.assertEqual(status, SCRAPE_FAILED)
+        self.assertEqual(failed['new_jobs'], 0)
+        self.delay.assert_called_once()
+
+    def test_broker_error_releases_the_lock(self):
+        self.delay.side_effect = ConnectionError("broker down")
+        with self.assertRaises(ConnectionError):
+            start_scrape("Python", "Europe")
+
+        self.delay.side_effect = None
+        status, record = start_scrape("Python", "Europe")
+        self.assertEqual(status, SCRAPE_STARTED)
+        self.assertEqual(self.delay.call_count, 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ScrapeStatusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.record = {
+            'id': str(uuid.uuid4()), 'keyword': "Python", 'location': "Europe", 'status': SCRAPE_RUNNING,
+            'started_at': "2026-03-01T12:00:00+00:00", 'finished_at': None, 'new_jobs': None,
+        }
+        save_scrape_record(self.record, timeout=60)
+        self.url = reverse('scrape-status', args=[self.record['id']])
+
+    def test_record(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.record)
+
+    def test_unknown_scrape(self):
+        response = self.client.get(reverse('scrape-status', args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_wait(self):
+        self.assertEqual(self.client.get(f"{self.url}?wait=soon").status_code, 400)
+
+    def test_wait_returns_once_done(self):
+        done = {**self.record, 'status': SCRAPE_DONE, 'new_jobs': 3}
+        statuses = iter([self.record, self.record, done])
+        with mock.patch('jobs.views.scrape_record', side_effect=lambda scrape_id: next(statuses)), \
+                mock.patch('jobs.views.time.sleep') as sleep:
+            response = self.client.get(f"{self.url}?wait=30")
+        self.assertEqual(response.json(), done)
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch.object(ScrapeStatusAPI, 'MAX_WAIT', 0.2)
+    @mock.patch.object(ScrapeStatusAPI, 'POLL_INTERVAL', 0.05)
+    def test_wait_is_capped(self):
+        started = time.monotonic()
+        response = self.client.get(f"{self.url}?wait=3600")
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.json()['status'], SCRAPE_RUNNING)
+
+    @mock.patch('jobs.views.time.sleep')
+    def test_no_wait(self, sleep):
+        for params in ("", "?wait=0", "?wait=-5"):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(f"{self.url}{params}").json()['status'], SCRAPE_RUNNING)
+        sleep.assert_not_called()
+
+    @mock.patch('jobs.views.time.sleep')
+    def test_too_many_waiters(self, sleep):
+        # No slot left: the current status comes back right away
+        with mock.patch('jobs.views._STATUS_WAITERS', threading.BoundedSemaphore(1)) as waiters:
+            waiters.acquire()
+            response = self.client.get(f"{self.url}?wait=30")
+        self.assertEqual(response.json()['status'], SCRAPE_RUNNING)
+        sleep.assert_not_called()
+
+
+class ResponseFieldsTests(JobListTestCase):
+    # Every field of a job, in response order; the search document and fingerprint never are
+    ALL_FIELDS = [
+        'id', 'title', 'company', 'location', 'url', 'source', 'posted_at', 'created_at', 'description',
+        'skills', 'seniority', 'salary_min', 'salary_max', 'currency',
+    ]
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(JobDetailAPI, 'throttle_classes', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job = make_job(1, date(2026, 3, 1), description="<p>Python and Django</p>", skills=["Python", "Django"],
+                            salary_min=60000, salary_max=80000, currency="EUR")
+
+    def results(self, params=""):
+        response = self.client.get(f"{self.url}?{params}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_default_fields(self):
+        job, = self.results()
+        self.assertEqual(list(job), [name for name in self.ALL_FIELDS if name != 'description'])
+
+    def test_same_values_as_the_serializer(self):
+        job, = self.results("fields=" + ",".join(self.ALL_FIELDS))
+        self.assertEqual(job, JobSerializer(self.job).data)
+
+    def test_fields(self):
+        job, = self.results("fields=url, title")
+        # Serializer order, whatever the order asked for
+        self.assertEqual(list(job), ['title', 'url'])
+        job, = self.results("fields=title,description")
+        self.assertEqual(job, {'title': "Job 1", 'description': "<p>Python and Django</p>"})
+
+    def test_exclude(self):
+        job, = self.results("exclude=skills,created_at")
+        self.assertEqual(list(job), [name for name in self.ALL_FIELDS if name not in ('description', 'skills', 'created_at')])
+        job, = self.results("fields=title,url,skills&exclude=skills")
+        self.assertEqual(list(job), ['title', 'url'])
+
+    def test_unknown_field(self):
+        for params in ("fields=title,fingerprint", "exclude=search_vector", "fields=nope"):
+            with self.subTest(params=params):
+                response = self.client.get(f"{self.url}?{params}")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('fields', response.json())
+
+    def test_detail(self):
+        response = self.client.get(reverse('job-detail', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 200)
+        job = response.json()
+        self.assertEqual(list(job), self.ALL_FIELDS)
+        self.assertEqual(job['description'], "<p>Python and Django</p>")
+        self.assertEqual(job, JobSerializer(self.job).data)
+
+    def test_detail_not_found(self):
+        self.assertEqual(self.client.get(reverse('job-detail', args=[self.job.pk + 1])).status_code, 404)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, JOBS_EXPORT_CHUNK_SIZE=2)
+class JobExportTests(TestCase):
+    url = reverse('job-export')
+
+    def setUp(self):
+        cache.clear()
+        _, key = APIKey.objects.create_key(name="test")
+        self.auth = {'HTTP_AUTHORIZATION': f"Api-Key {key}"}
+        self.jobs = [
+            make_job(1, date(2026, 3, 1), description="<p>Python</p>", skills=["Python", "Django"], salary_min=50000),
+            make_job(2, skills=["Go"]),
+            make_job(3, date(2026, 3, 2), skills=["Python"], currency="EUR"),
+            make_job(4),
+            make_job(5, description="Line one\nline, two"),
+        ]
+
+    def export(self, params="", **headers):
+        response = self.client.get(f"{self.url}?{params}", **self.auth, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def test_api_key_required(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Api-Key wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_ndjson(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="jobs.ndjson"')
+        # Every field, description included, in id order
+        self.assertEqual([json.loads(line) for line in body.splitlines()], [JobSerializer(job).data for job in self.jobs])
+
+    def test_filters(self):
+        _, body = self.export("skills=python")
+        self.assertEqual([json.loads(line)['id'] for line in body.splitlines()], [self.jobs[0].id, self.jobs[2].id])
+        _, body = self.export("skills=cobol")
+        self.assertEqual(body, b'')
+
+    def test_csv(self):
+        for params, headers in (("format=csv", {}), ("", {'HTTP_ACCEPT': 'text/csv'})):
+            with self.subTest(params=params, headers=headers):
+                response, body = self.export(f"{params}&fields=id,title,description,skills,salary_min", **headers)
+                self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+                self.assertEqual(response['Content-Disposition'], 'attachment; filename="jobs.csv"')
+                rows = list(csv.reader(io.StringIO(body.decode())))
+                self.assertEqual(rows[0], ['id', 'title', 'description', 'skills', 'salary_min'])
+                self.assertEqual(rows[1], [str(self.jobs[0].id), "Job 1", "<p>Python</p>", "Python, Django", "50000"])
+                self.assertEqual(rows[2], [str(self.jobs[1].id), "Job 2", "", "Go", ""])
+                self.assertEqual(rows[5][2], "Line one\nline, two")
+                self.assertEqual(len(rows), 1 + len(self.jobs))
+
+    def test_fields_and_exclude(self):
+        _, body = self.export("fields=url,title")
+        self.assertEqual(json.loads(body.splitlines()[0]), {'title': "Job 1", 'url': "https://example.com/jobs/1"})
+        _, body = self.export("exclude=description,created_at")
+        self.assertNotIn('description', json.loads(body.splitlines()[0]))
+        self.assertNotIn('created_at', json.loads(body.splitlines()[0]))
+
+    def test_unknown_field(self):
+        for params in ("fields=fingerprint", "format=csv&exclude=nope"):
+            with self.subTest(params=params):
+                response = self.client.get(f"{self.url}?{params}", **self.auth)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(b'fields', response.content)
+
+    def test_gzip(self):
+        _, plain = self.export()
+        response, body = self.export(HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(body), plain)
+
+        response, body = self.export(HTTP_ACCEPT_ENCODING='br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(body, plain)
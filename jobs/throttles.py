@@ -47,4 +47,18 @@ class PremiumTierThrottle(SimpleRateThrottle):
                 'ident': api_key.id
             }
         except:
-            return None  # Invalid key, ignore.
\ No newline at end of file
+            return None  # Invalid key, ignore.
+
+class ScrapeStatusThrottle(SimpleRateThrottle):
+    """
+    Limits scrape status polling to 60/minute per client (by IP), key or not.
+    A separate scope: polls are cheap and don't count against the daily quotas.
+    """
+    scope = 'scrape_status'
+    rate = '60/min'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
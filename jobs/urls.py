@@ -1,10 +1,19 @@
 from django.urls import path
-from .views import JobListAPI, ScrapeTriggerAPI
+from .views import JobListAPI, JobDetailAPI, JobExportAPI, ScrapeTriggerAPI, ScrapeStatusAPI
 
 urlpatterns = [
     # Map 'api/jobs/'
     path('jobs/', JobListAPI.as_view(), name='job-list'),
 
+    # Map 'api/jobs/<id>/' (one job in full, description included)
+    path('jobs/<int:pk>/', JobDetailAPI.as_view(), name='job-detail'),
+
+    # Map 'api/jobs/export/' (streamed NDJSON/CSV export, API keys only)
+    path('jobs/export/', JobExportAPI.as_view(), name='job-export'),
+
     # Map 'api/scrape/'
     path('scrape/', ScrapeTriggerAPI.as_view(), name='job-scrape'),
+
+    # Map 'api/scrape/<id>/' (status / long-poll of one scrape)
+    path('scrape/<uuid:scrape_id>/', ScrapeStatusAPI.as_view(), name='scrape-status'),
 ]
\ No newline at end of file
@@ -1,58 +1,184 @@
-import re
+import logging
+import threading
+import time
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from django.urls import reverse
 from rest_framework import generics, filters, serializers
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.renderers import BrowsableAPIRenderer
 from django_filters import rest_framework as django_filters
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from rest_framework.pagination import PageNumberPagination
 
 # --- NEW SECURITY IMPORTS ---
 from rest_framework_api_key.permissions import HasAPIKey
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from .throttles import FreeTierThrottle, PremiumTierThrottle # <--- Import your throttles
+from .throttles import FreeTierThrottle, PremiumTierThrottle, ScrapeStatusThrottle # <--- Import your throttles
 
 from .models import Job
-from .serializers import JobSerializer
-from .tasks import run_scrapers
+from .pagination import JobPagination
+from .search import search_jobs, filter_skills, filter_text
+from .serializers import JobSerializer, LIST_DEFERRED_FIELDS, serialize_job_rows
+from .renderers import ORJSONRenderer, NDJSONRenderer, CSVRenderer
+from .export import row_chunks, ndjson_stream, csv_stream
+from .metrics import api_timer, API_CACHE_REQUESTS
+from .response_cache import list_cache_key, list_etag, etag_matches, get_cached, set_cached
+from .tasks import start_scrape, scrape_record, SCRAPE_STARTED, SCRAPE_RUNNING, SCRAPE_DONE, SCRAPE_FAILED
+
+logger = logging.getLogger(__name__)
+
+
+def scrape_links(request, record):
+    """Where a client follows a scrape instead of polling /api/jobs/."""
+    status_url = request.build_absolute_uri(reverse('scrape-status', args=[record['id']]))
+    return {"scrape_id": record['id'], "status_url": status_url}
+
+
+def response_fields(request, deferred=LIST_DEFERRED_FIELDS):
+    """
+    Sparse fieldset of a response: ?fields=title,company,url and/or ?exclude=skills.
+    Without ?fields, every field but `deferred` (for the list: the HTML descriptions,
+    most of the payload); GET /api/jobs/<id>/ returns a job in full.
+    """
+    available = list(JobSerializer().fields)
+    fields = [name.strip() for name in request.query_params.get('fields', '').split(',') if name.strip()]
+    exclude = [name.strip() for name in request.query_params.get('exclude', '').split(',') if name.strip()]
+
+    unknown = [name for name in fields + exclude if name not in available]
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}."})
+
+    if not fields:
+        fields = [name for name in available if name not in deferred]
+    return [name for name in fields if name not in exclude]
+
 
 # --- 1. Define the Custom Filter (The Input Boxes) ---
 class JobFilter(django_filters.FilterSet):
     # specific boxes for searching
-    title = django_filters.CharFilter(lookup_expr='icontains')
-    company = django_filters.CharFilter(lookup_expr='icontains')
-    location = django_filters.CharFilter(lookup_expr='icontains')
+    # Substring matches; add fuzzy=true to tolerate typos (Postgres)
+    title = django_filters.CharFilter(method='filter_text')
+    company = django_filters.CharFilter(method='filter_text')
+    location = django_filters.CharFilter(method='filter_text')
+    fuzzy = django_filters.BooleanFilter(method='filter_noop')
 
     # The "Skills" box you wanted!
-    # (We search the text inside the JSON list)
+    # Comma-separated: ?skills=Python,Django needs both,
+    # ?skills=Python,Django&skills_match=any needs either
     skills = django_filters.CharFilter(method='filter_skills')
-    seniority = django_filters.CharFilter(lookup_expr='icontains')
+    skills_match = django_filters.ChoiceFilter(
+        choices=[('all', 'All skills'), ('any', 'Any skill')], method='filter_noop',
+    )
+    # Categorical values ("Senior", "LinkedIn"): whole-value match, any case
+    seniority = django_filters.CharFilter(lookup_expr='iexact')
+    source = django_filters.CharFilter(lookup_expr='iexact')
     # Keep salary filter
     salary_min = django_filters.NumberFilter(field_name='salary_min', lookup_expr='gte')
+    # Full-text search over title, company, skills and description, ranked by relevance
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Job
-        fields = ['title', 'company', 'location', 'skills', 'seniority', 'salary_min', 'source']
+        fields = ['title', 'company', 'location', 'fuzzy', 'skills', 'skills_match', 'seniority', 'salary_min', 'source', 'search']
+
+    def filter_text(self, queryset, name, value):
+        if not value:
+            return queryset
+        return filter_text(queryset, name, value, fuzzy=bool(self.form.cleaned_data.get('fuzzy')))
 
     def filter_skills(self, queryset, name, value):
         if not value:
             return queryset
 
-        # We search for the value wrapped in quotes.
         # In the DB, the list looks like: ["Java", "Python"]
-        # Searching for "Java" (with quotes) matches "Java" but NOT "JavaScript".
-        # iregex makes it case-insensitive but quote-sensitive.
-        return queryset.filter(skills__iregex=f'"{re.escape(value)}"')
+        skills = [skill.strip() for skill in value.split(',') if skill.strip()]
+        match_all = self.form.cleaned_data.get('skills_match') != 'any'
+        return filter_skills(queryset, skills, match_all=match_all)
+
+    def filter_noop(self, queryset, name, value):
+        # skills_match and fuzzy only change how the other filters match
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        if not value:
+            return queryset
+        return search_jobs(queryset, value)
+
+
+@extend_schema_view(get=extend_schema(parameters=[
+    OpenApiParameter('fields', str, description="Comma-separated fields to return, e.g. title,company,url. "
+                                                "description is only returned when listed here."),
+    OpenApiParameter('exclude', str, description="Comma-separated fields to leave out."),
+]))
 class JobListAPI(generics.ListAPIView):
-    queryset = Job.objects.all().order_by('-posted_at')
+    # The search document is only used in WHERE/ORDER BY, never sent back
+    queryset = Job.objects.defer('search_vector').order_by('-posted_at', '-id')
+    # Documents the response; list() builds it from values() rows (see serialize_job_rows)
     serializer_class = JobSerializer
+    pagination_class = JobPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     filter_backends = [django_filters.DjangoFilterBackend]
     filterset_class = JobFilter
 
     throttle_classes = [PremiumTierThrottle, FreeTierThrottle]
 
+    # Set by list() when the response can be cached and validated
+    cache_key = None
+    etag = None
+
+    def dispatch(self, request, *args, **kwargs):
+        with api_timer('job-list', 'total'):
+            response = super().dispatch(request, *args, **kwargs)
+            # Cache hits are already rendered
+            if isinstance(response, Response):
+                # Render here (instead of in Django's handler) so JSON encoding is timed too
+                with api_timer('job-list', 'render'):
+                    response.render()
+                if self.cache_key and response.status_code == 200:
+                    response['ETag'] = self.etag
+                    set_cached(self.cache_key, response.content)
+        return response
+
+    def check_throttles(self, request):
+        with api_timer('job-list', 'throttle'):
+            super().check_throttles(request)
+
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        pagination_class = StandardResultsSetPagination
+        # Repeated searches (same parameters, no write since) are answered without the DB:
+        # 304 if the client's ETag is current, else the stored bytes.
+        # Only JSON: the browsable API renders per user.
+        cache_key = None
+        if request.accepted_renderer.format == 'json':
+            with api_timer('job-list', 'cache'):
+                cache_key = list_cache_key(request)
+                etag = list_etag(cache_key) if cache_key else None
+                if etag and etag_matches(request, etag):
+                    API_CACHE_REQUESTS.labels('job-list', 'not_modified').inc()
+                    return HttpResponseNotModified(headers={'ETag': etag})
+                content = get_cached(cache_key) if cache_key else None
+            if content is not None:
+                API_CACHE_REQUESTS.labels('job-list', 'hit').inc()
+                return HttpResponse(content, content_type=request.accepted_renderer.media_type, headers={'ETag': etag})
+            API_CACHE_REQUESTS.labels('job-list', 'miss').inc()
+
+        # Same as ListModelMixin.list, split into timed stages.
+        # The queryset is lazy: the DB work happens when the page is taken.
+        fields = response_fields(request)
+        with api_timer('job-list', 'query'):
+            # Plain dicts of the returned columns only (id and posted_at: ordering and cursors)
+            columns = dict.fromkeys(['id', 'posted_at', *fields])
+            queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+            page = self.paginate_queryset(queryset)
+            rows = page if page is not None else list(queryset)
+        with api_timer('job-list', 'serialization'):
+            data = serialize_job_rows(rows, fields)
+        response = self.get_paginated_response(data) if page is not None else Response(data)
 
         # Handle Pagination (access 'results') vs No Pagination (access list directly)
         current_results = response.data['results'] if isinstance(response.data, dict) else response.data
@@ -66,18 +192,82 @@ class JobListAPI(generics.ListAPIView):
             term_to_scrape = search_term or skills_term
 
             if term_to_scrape:
-                print(f"No results for '{term_to_scrape}'. Triggering scraper...")
-                run_scrapers.delay(keyword=term_to_scrape, location="Europe")
+                # Identical misses from many clients share one crawl
+                scrape_status, record = start_scrape(term_to_scrape, "Europe")
+                logger.info("No results for %r, scrape: %s", term_to_scrape, scrape_status)
 
+                messages = {
+                    SCRAPE_STARTED: "We have started a live scrape for you. Follow it at status_url (?wait=30 to wait for it).",
+                    SCRAPE_RUNNING: "A live scrape for it is already in progress. Follow it at status_url (?wait=30 to wait for it).",
+                    SCRAPE_DONE: "It was scraped a few minutes ago without results. Try again later.",
+                    SCRAPE_FAILED: "The last live scrape for it failed. Try again later.",
+                }
                 return Response({
-                    "message": f"No jobs found for '{term_to_scrape}'. We have started a live scrape for you. Check back in 2 minutes!",
+                    "message": f"No jobs found for '{term_to_scrape}'. {messages[scrape_status]}",
+                    "scrape_status": scrape_status,
+                    **scrape_links(request, record),
                     "results": []
                 })
 
+        # Misses that start a scrape above are never cached nor validated
+        if cache_key:
+            self.cache_key, self.etag = cache_key, etag
         return response
 
 
-# --- 3. The Scraper Trigger (No changes here) ---
+class JobDetailAPI(generics.RetrieveAPIView):
+    """One job with every field, description included."""
+    queryset = Job.objects.defer('search_vector')
+    serializer_class = JobSerializer
+
+    throttle_classes = [PremiumTierThrottle, FreeTierThrottle]
+
+
+class JobExportAPI(generics.GenericAPIView):
+    """
+    Bulk export for API key holders: every job matching the JobFilter parameters
+    in one streamed response, NDJSON (default, ?format=ndjson) or CSV (?format=csv).
+    Rows are read through a server-side cursor and written chunk by chunk,
+    so server memory stays flat whatever the size of the result.
+    Gzip-compressed when the client sends Accept-Encoding: gzip.
+    One throttle hit per export.
+    """
+    queryset = Job.objects.order_by('id')
+    serializer_class = JobSerializer
+    filter_backends = [django_filters.DjangoFilterBackend]
+    filterset_class = JobFilter
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    permission_classes = [HasAPIKey]
+    throttle_classes = [PremiumTierThrottle]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('fields', str, description="Comma-separated fields to export (default: all)."),
+            OpenApiParameter('exclude', str, description="Comma-separated fields to leave out."),
+        ],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.STR, (200, 'text/csv'): OpenApiTypes.STR},
+    )
+    def get(self, request):
+        fields = response_fields(request, deferred=())
+        queryset = self.filter_queryset(self.get_queryset())
+        chunks = row_chunks(queryset, fields, settings.JOBS_EXPORT_CHUNK_SIZE)
+
+        export_format = request.accepted_renderer.format
+        stream = csv_stream(chunks, fields) if export_format == 'csv' else ndjson_stream(chunks)
+        content_type = 'text/csv; charset=utf-8' if export_format == 'csv' else NDJSONRenderer.media_type
+
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response = StreamingHttpResponse(compress_sequence(stream), content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = StreamingHttpResponse(stream, content_type=content_type)
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response['Content-Disposition'] = f'attachment; filename="jobs.{export_format}"'
+        return response
+
+
+# --- 3. The Scraper Trigger ---
 
 class ScrapeRequestSerializer(serializers.Serializer):
     keyword = serializers.CharField(default="Python", help_text="Job title or skill")
@@ -92,15 +282,82 @@ class ScrapeTriggerAPI(APIView):
             keyword = serializer.validated_data['keyword']
             location = serializer.validated_data['location']
 
-            run_scrapers.delay(keyword, location)
+            # At most one crawl per search at a time (see start_scrape)
+            scrape_status, record = start_scrape(keyword, location)
 
+            messages = {
+                SCRAPE_STARTED: "Scraper started successfully",
+                SCRAPE_RUNNING: "A scrape for this search is already in progress",
+                SCRAPE_DONE: "This search was scraped recently, results are already in",
+                SCRAPE_FAILED: "This search was scraped recently but the scrape failed",
+            }
             return Response({
-                "message": "Scraper started successfully",
+                "message": messages[scrape_status],
+                "status": scrape_status,
                 "target": f"{keyword} jobs in {location}",
-                "note": "Check back in 2-3 minutes for results."
+                **scrape_links(request, record),
+                "note": "GET status_url?wait=30 returns as soon as the scrape finishes (or after 30s)."
             })
         return Response(serializer.errors, status=400)
 
+
+class ScrapeStatusSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    keyword = serializers.CharField()
+    location = serializers.CharField()
+    status = serializers.ChoiceField(choices=[SCRAPE_RUNNING, SCRAPE_DONE, SCRAPE_FAILED])
+    started_at = serializers.DateTimeField()
+    finished_at = serializers.DateTimeField(allow_null=True)
+    new_jobs = serializers.IntegerField(allow_null=True, help_text="New jobs matching the keyword, once done")
+
+
+# Long-polls currently held by this process (see SCRAPE_STATUS_MAX_WAITERS)
+_STATUS_WAITERS = threading.BoundedSemaphore(settings.SCRAPE_STATUS_MAX_WAITERS)
+
+
+class ScrapeStatusAPI(APIView):
+    """
+    Status of an on-demand scrape: running, done (with the number of new jobs
+    matching its keyword) or failed.
+    With ?wait=N (up to 30 seconds) the request is held until the scrape
+    finishes (long-poll), so clients don't have to poll /api/jobs/.
+    Has its own throttle scope (it only reads the cache), and when too many
+    requests are already waiting it answers right away instead of holding one more.
+    """
+    throttle_classes = [ScrapeStatusThrottle]
+
+    MAX_WAIT = 30  # seconds
+    POLL_INTERVAL = 0.5  # seconds
+
+    @extend_schema(
+        parameters=[OpenApiParameter('wait', float, description="Seconds to wait for the scrape to finish (max 30).")],
+        responses={200: ScrapeStatusSerializer, 400: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+    )
+    def get(self, request, scrape_id):
+        try:
+            wait = min(float(request.query_params.get('wait', 0)), self.MAX_WAIT)
+        except ValueError:
+            return Response({"wait": "Must be a number of seconds."}, status=400)
+
+        record = scrape_record(scrape_id)
+        if wait > 0 and record is not None and record['status'] == SCRAPE_RUNNING:
+            if _STATUS_WAITERS.acquire(blocking=False):
+                try:
+                    record = self.wait_for(scrape_id, record, time.monotonic() + wait)
+                finally:
+                    _STATUS_WAITERS.release()
+
+        if record is None:
+            return Response({"detail": "Unknown or expired scrape."}, status=404)
+        return Response(record)
+
+    def wait_for(self, scrape_id, record, deadline):
+        while record is not None and record['status'] == SCRAPE_RUNNING and time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            record = scrape_record(scrape_id)
+        return record
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size' # User can use ?page_size=50
@@ -0,0 +1,67 @@
+import json
+import sqlite3
+import zlib
+from pathlib import Path
+
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+
+
+class ArchiveCacheStorage:
+    """
+    HTTP cache storage that keeps every response of a spider in one SQLite file
+    (<HTTPCACHE_DIR>/<spider>.sqlite, bodies zlib-compressed).
+
+    Used by SCRAPER_ARCHIVE_MODE: "record" fills the archive from the network,
+    "replay" serves the crawl from it and never touches the network.
+    A single portable file per spider is easy to copy around and to commit as a fixture.
+    """
+
+    def __init__(self, settings):
+        self.archive_dir = data_path(settings['HTTPCACHE_DIR'], createdir=True)
+        self.db = None
+        self._fingerprinter = None
+
+    def open_spider(self, spider):
+        path = Path(self.archive_dir, f"{spider.name}.sqlite")
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "fingerprint TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB)"
+        )
+        self._fingerprinter = spider.crawler.request_fingerprinter
+
+    def close_spider(self, spider):
+        self.db.commit()
+        self.db.close()
+
+    def retrieve_response(self, spider, request):
+        row = self.db.execute(
+            "SELECT url, status, headers, body FROM responses WHERE fingerprint = ?",
+            (self._fingerprinter.fingerprint(request).hex(),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        url, status, headers, body = row
+        headers = Headers(json.loads(headers))
+        body = zlib.decompress(body)
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body)
+
+    def store_response(self, spider, request, response):
+        headers = {
+            key.decode('latin-1'): [value.decode('latin-1') for value in values]
+            for key, values in response.headers.items()
+        }
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (
+                self._fingerprinter.fingerprint(request).hex(),
+                response.url,
+                response.status,
+                json.dumps(headers),
+                zlib.compress(response.body),
+            ),
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .utils import parse_salary, extract_skills, extract_seniority
+
+# Fields the extractors read. Only these are shipped to the worker processes.
+ENRICHMENT_INPUT_FIELDS = ('title', 'company', 'description')
+
+
+def enrich(fields):
+    """
+    Runs the CPU-heavy text analysis for one job.
+    Returns the values to store next to the scraped fields.
+    """
+    title = fields.get('title')
+    description = fields.get('description')
+    company = fields.get('company')
+
+    # Combine text for analysis
+    text_to_scan = f"{title} {company} {description}"
+
+    min_sal, max_sal, curr = parse_salary(text_to_scan)
+
+    return {
+        'skills': extract_skills(text_to_scan),
+        'seniority': extract_seniority(title, description),
+        'salary_min': min_sal,
+        'salary_max': max_sal,
+        'currency': curr,
+    }
+
+
+def enrich_batch(batch):
+    return [enrich(fields) for fields in batch]
+
+
+# Worker pools are shared by every crawl that runs in this process
+_POOLS = {}
+
+
+def get_pool(processes):
+    if processes not in _POOLS:
+        # 'spawn' keeps the workers free of the reactor threads and DB connections
+        _POOLS[processes] = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _POOLS[processes]
+
+
+class Enricher:
+    """
+    Enriches batches of items in a pool of worker processes (one per core by default),
+    so a big crawl uses every core instead of the reactor thread.
+    Results come back in the same order as the input.
+    """
+
+    # Below this many items per worker the IPC costs more than it saves
+    MIN_ITEMS_PER_PROCESS = 10
+
+    def __init__(self, processes=None):
+        self.processes = processes or os.cpu_count() or 1
+
+    @property
+    def pool(self):
+        return get_pool(self.processes)
+
+    @staticmethod
+    def can_use_processes():
+        # Celery prefork children are daemonic, and daemonic processes can't start a
+        # pool: enrich on a thread there. Bulk sweeps use the ingest worker's pool
+        # instead (BULK_SCRAPE_INGEST_MODE), leaving only small on-demand crawls here.
+        return not multiprocessing.current_process().daemon
+
+    def _use_pool(self, batch):
+        # Small batches (end of a crawl, tiny feeds): a worker thread is enough
+        return len(batch) >= 2 * self.MIN_ITEMS_PER_PROCESS and self.can_use_processes()
+
+    def _batch(self, items):
+        return [{name: item.get(name) for name in ENRICHMENT_INPUT_FIELDS} for item in items]
+
+    def _chunks(self, batch):
+        size = max(self.MIN_ITEMS_PER_PROCESS, -(-len(batch) // self.processes))
+        return [batch[i:i + size] for i in range(0, len(batch), size)]
+
+    async def enrich(self, items):
+        batch = self._batch(items)
+        loop = asyncio.get_running_loop()
+
+        if not self._use_pool(batch):
+            return await loop.run_in_executor(None, enrich_batch, batch)
+
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self.pool, enrich_batch, chunk) for chunk in self._chunks(batch)
+        ))
+        return [enriched for chunk in results for enriched in chunk]
+
+    def enrich_blocking(self, items):
+        """Same as enrich(), for callers without an event loop (the ingest worker)."""
+        batch = self._batch(items)
+        if not self._use_pool(batch):
+            return enrich_batch(batch)
+        return [enriched for chunk in self.pool.map(enrich_batch, self._chunks(batch)) for enriched in chunk]
@@ -0,0 +1,67 @@
+from prometheus_client import Counter, Gauge, Histogram
+from scrapy import signals
+
+# Exposed by the Django app at /metrics (see jobs/metrics.py)
+
+SPIDER_RESPONSES = Counter(
+    'scraper_responses_total', "Responses received by spiders, by HTTP status.",
+    ['spider', 'status'],
+)
+SPIDER_ITEMS = Counter('scraper_items_total', "Items scraped.", ['spider'])
+SPIDER_ERRORS = Counter('scraper_errors_total', "Errors logged during crawls.", ['spider'])
+# detail_requests / cards is the share of listing cards that cost a detail request
+SPIDER_CARDS = Counter('scraper_cards_total', "Listing cards seen.", ['spider'])
+SPIDER_DETAIL_REQUESTS = Counter('scraper_detail_requests_total', "Detail pages requested.", ['spider'])
+CRAWL_SECONDS = Histogram(
+    'scraper_crawl_duration_seconds', "Wall time of a crawl.", ['spider'],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+CRAWL_ITEMS_PER_SECOND = Gauge(
+    'scraper_crawl_items_per_second', "Throughput of the last finished crawl.", ['spider'],
+    multiprocess_mode='mostrecent',
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    'scraper_pipeline_stage_seconds', "Time per batch in each ingest stage (dedupe, enrich, write).",
+    ['stage'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# Ban responses: rate limited (429) and LinkedIn's refusal (999)
+BAN_STATUSES = {429, 999}
+
+
+class CrawlMetrics:
+    """
+    Extension that feeds the crawl metrics above: responses and items as they
+    happen, errors, detail-fetch counts and throughput when the spider closes.
+    Ban rate = scraper_responses_total{status=~"429|999"} / scraper_responses_total.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler.stats)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def response_received(self, response, request, spider):
+        if 'cached' not in response.flags:
+            SPIDER_RESPONSES.labels(spider.name, str(response.status)).inc()
+
+    def item_scraped(self, item, response, spider):
+        SPIDER_ITEMS.labels(spider.name).inc()
+
+    def spider_closed(self, spider, reason):
+        stats = self.stats.get_stats()
+        SPIDER_ERRORS.labels(spider.name).inc(stats.get('log_count/ERROR', 0))
+        SPIDER_CARDS.labels(spider.name).inc(stats.get('spider/cards', 0))
+        SPIDER_DETAIL_REQUESTS.labels(spider.name).inc(stats.get('spider/detail_requests', 0))
+
+        elapsed = stats.get('elapsed_time_seconds')
+        if elapsed:
+            CRAWL_SECONDS.labels(spider.name).observe(elapsed)
+            CRAWL_ITEMS_PER_SECOND.labels(spider.name).set(stats.get('item_scraped_count', 0) / elapsed)
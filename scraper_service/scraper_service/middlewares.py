@@ -3,7 +3,17 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import redis
+import redis.asyncio
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy_user_agents.middlewares import RandomUserAgentMiddleware
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
@@ -53,48 +63,252 @@ class ScraperServiceSpiderMiddleware:
         spider.logger.info("Spider opened: %s" % spider.name)
 
 
-class ScraperServiceDownloaderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the downloader middleware does not modify the
-    # passed objects.
+# Marks the end of a callback's output (callbacks may yield None)
+_DONE = object()
+
+
+class ParseTimingMiddleware:
+    """
+    Adds the time spent inside spider callbacks to the 'spider/parse_seconds' stat
+    (the parse stage reported by `manage.py bench_scrape`).
+    Enabled right next to the spider, so other middlewares are not timed.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
 
     @classmethod
     def from_crawler(cls, crawler):
-        # This method is used by Scrapy to create your spiders.
-        s = cls()
-        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
-        return s
+        return cls(crawler.stats)
+
+    def process_spider_output(self, response, result, spider):
+        iterator = iter(result)
+        while True:
+            started = time.perf_counter()
+            output = next(iterator, _DONE)
+            self.stats.inc_value('spider/parse_seconds', time.perf_counter() - started)
+            if output is _DONE:
+                return
+            yield output
+
+    async def process_spider_output_async(self, response, result, spider):
+        iterator = aiter(result)
+        while True:
+            started = time.perf_counter()
+            output = await anext(iterator, _DONE)
+            self.stats.inc_value('spider/parse_seconds', time.perf_counter() - started)
+            if output is _DONE:
+                return
+            yield output
+
+
+def match_domain(request, domains):
+    """Returns the entry of `domains` that the request's host is, or is a subdomain of."""
+    host = urlparse_cached(request).hostname or ""
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return None
+
+
+def retry_after_seconds(response):
+    """Parses a Retry-After header (seconds or HTTP date). Returns None if absent or invalid."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.decode('latin-1').strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveThrottleMiddleware:
+    """
+    Per-domain delay and concurrency that adapt to how each site responds.
+
+    Domains in THROTTLE_TARGETS start at their target delay/concurrency (subdomains
+    share one downloader slot); others use DOWNLOAD_DELAY / CONCURRENT_REQUESTS_PER_DOMAIN.
+    - 429/999 (or a 503 with Retry-After): delay doubles, and is at least Retry-After,
+      up to THROTTLE_MAX_DELAY; concurrency drops to 1
+    - responses slower than THROTTLE_MAX_LATENCY: delay x1.5, one less concurrent request
+    - other responses: delay goes back down toward its target (x0.75 each);
+      at target, one concurrent request is added back every THROTTLE_RECOVERY_STREAK responses
+    Runs before RetryMiddleware, so the retried request already goes out slower.
+    """
+
+    THROTTLE_CODES = {429, 999}
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.targets = settings.getdict('THROTTLE_TARGETS')
+        self.default_target = {
+            'delay': settings.getfloat('DOWNLOAD_DELAY'),
+            'concurrency': settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN'),
+        }
+        self.max_delay = settings.getfloat('THROTTLE_MAX_DELAY', 60.0)
+        self.max_latency = settings.getfloat('THROTTLE_MAX_LATENCY', 5.0)
+        self.recovery_streak = settings.getint('THROTTLE_RECOVERY_STREAK', 10)
+        # slot key -> current delay/concurrency, their targets and the success streak
+        self.states = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def slot_key(self, request):
+        domain = match_domain(request, self.targets)
+        if domain is not None:
+            # www.linkedin.com and linkedin.com share a budget
+            request.meta.setdefault('download_slot', domain)
+        return request.meta.get('download_slot') or urlparse_cached(request).hostname or ""
+
+    def state_for(self, key):
+        if key not in self.states:
+            target = {**self.default_target, **self.targets.get(key, {})}
+            self.states[key] = {
+                'delay': float(target['delay']),
+                'concurrency': int(target['concurrency']),
+                'target_delay': float(target['delay']),
+                'target_concurrency': int(target['concurrency']),
+                'streak': 0,
+            }
+        return self.states[key]
+
+    def apply(self, key, state):
+        downloader = self.crawler.engine.downloader
+        # New (or garbage-collected and recreated) slots start from the current values
+        downloader.per_slot_settings[key] = {
+            **downloader.per_slot_settings.get(key, {}),
+            'delay': state['delay'],
+            'concurrency': state['concurrency'],
+        }
+        slot = downloader.slots.get(key)
+        if slot is not None:
+            slot.delay = state['delay']
+            slot.concurrency = state['concurrency']
 
     def process_request(self, request, spider):
-        # Called for each request that goes through the downloader
-        # middleware.
-
-        # Must either:
-        # - return None: continue processing this request
-        # - or return a Response object
-        # - or return a Request object
-        # - or raise IgnoreRequest: process_exception() methods of
-        #   installed downloader middleware will be called
+        key = self.slot_key(request)
+        if key not in self.states:
+            self.apply(key, self.state_for(key))
         return None
 
     def process_response(self, request, response, spider):
-        # Called with the response returned from the downloader.
+        if 'cached' in response.flags:
+            return response
 
-        # Must either;
-        # - return a Response object
-        # - return a Request object
-        # - or raise IgnoreRequest
+        key = self.slot_key(request)
+        state = self.state_for(key)
+        retry_after = retry_after_seconds(response)
+        latency = request.meta.get('download_latency') or 0.0
+        stats = self.crawler.stats
+
+        if response.status in self.THROTTLE_CODES or (response.status == 503 and retry_after is not None):
+            state['delay'] = min(self.max_delay, max(state['delay'] * 2, state['target_delay'], 1.0, retry_after or 0.0))
+            state['concurrency'] = 1
+            state['streak'] = 0
+            stats.inc_value('throttle/backoff')
+            spider.logger.info(f"Throttled by {key} ({response.status}), delay now {state['delay']:.1f}s")
+        elif latency > self.max_latency:
+            state['delay'] = min(self.max_delay, max(state['delay'] * 1.5, state['target_delay'], 1.0))
+            state['concurrency'] = max(1, state['concurrency'] - 1)
+            state['streak'] = 0
+            stats.inc_value('throttle/slow_response')
+        else:
+            state['delay'] = max(state['target_delay'], state['delay'] * 0.75)
+            if state['delay'] - state['target_delay'] < 0.05:
+                state['delay'] = state['target_delay']
+                state['streak'] += 1
+                if state['streak'] >= self.recovery_streak and state['concurrency'] < state['target_concurrency']:
+                    state['concurrency'] += 1
+                    state['streak'] = 0
+
+        self.apply(key, state)
         return response
 
-    def process_exception(self, request, exception, spider):
-        # Called when a download handler or a process_request()
-        # (from other downloader middleware) raises an exception.
 
-        # Must either:
-        # - return None: continue processing this exception
-        # - return a Response object: stops process_exception() chain
-        # - return a Request object: stops process_exception() chain
-        pass
+# Parsed user-agent pickers, per RANDOM_UA_* settings, shared by every crawl of the process
+_UA_PICKERS = {}
 
-    def spider_opened(self, spider):
-        spider.logger.info("Spider opened: %s" % spider.name)
+
+class CachedRandomUserAgentMiddleware(RandomUserAgentMiddleware):
+    """
+    scrapy_user_agents' RandomUserAgentMiddleware, but the user-agent list is parsed
+    once per process instead of once per crawler. Parsing it takes ~3s, and the
+    in-process crawl runner creates a new crawler (and middleware) for every crawl.
+    """
+
+    SETTINGS = ('RANDOM_UA_FALLBACK', 'RANDOM_UA_PER_PROXY', 'RANDOM_UA_TYPE',
+                'RANDOM_UA_SAME_OS_FAMILY', 'RANDOM_UA_FILE')
+
+    def __init__(self, crawler):
+        key = tuple(str(crawler.settings.get(name)) for name in self.SETTINGS)
+        if key not in _UA_PICKERS:
+            super().__init__(crawler)
+            _UA_PICKERS[key] = self.ua_picker
+        self.ua_picker = _UA_PICKERS[key]
+
+
+class SharedRateLimitMiddleware:
+    """
+    Enforces a per-domain request budget shared by every crawler on every worker.
+
+    Each request to a limited domain reserves the next free send slot in Redis
+    (one slot every SHARED_RATE_LIMITS[domain] seconds) and waits for it,
+    so parallel LinkedIn crawls together stay within one budget.
+    If Redis is unreachable, crawls fall back to their own DOWNLOAD_DELAY.
+    """
+
+    # Atomically hands out the next slot and returns how long to wait for it (ms)
+    RESERVE_SLOT_SCRIPT = """
+    local now = redis.call('TIME')
+    local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+    local next_ms = tonumber(redis.call('GET', KEYS[1]) or 0)
+    local slot = math.max(now_ms, next_ms)
+    local interval = tonumber(ARGV[1])
+    redis.call('SET', KEYS[1], string.format('%.0f', slot + interval),
+               'PX', string.format('%.0f', slot + interval - now_ms + 60000))
+    return slot - now_ms
+    """
+
+    def __init__(self, limits, redis_url):
+        self.limits = limits
+        self.redis_url = redis_url
+        self._reserve_slot = None
+        self._disabled = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        limits = crawler.settings.getdict('SHARED_RATE_LIMITS')
+        if not limits or not crawler.settings.get('SCRAPER_REDIS_URL'):
+            raise NotConfigured
+        return cls(limits, crawler.settings.get('SCRAPER_REDIS_URL'))
+
+    def interval_for(self, request):
+        domain = match_domain(request, self.limits)
+        if domain is None:
+            return None, None
+        return domain, float(self.limits[domain])
+
+    async def process_request(self, request, spider):
+        domain, interval = self.interval_for(request)
+        if domain is None or self._disabled:
+            return None
+
+        try:
+            if self._reserve_slot is None:
+                client = redis.asyncio.from_url(self.redis_url)
+                self._reserve_slot = client.register_script(self.RESERVE_SLOT_SCRIPT)
+            wait_ms = await self._reserve_slot(keys=[f"ratelimit:{domain}"], args=[int(interval * 1000)])
+        except redis.RedisError as e:
+            spider.logger.warning(f"Shared rate limiter unavailable ({e}), using DOWNLOAD_DELAY only")
+            self._disabled = True
+            return None
+
+        if wait_ms > 0:
+            await asyncio.sleep(wait_ms / 1000)
+        return None
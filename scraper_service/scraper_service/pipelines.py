@@ -1,39 +1,148 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
 from itemadapter import ItemAdapter
-from jobs.models import Job
+from jobs.ingest import job_row, changed_rows, upsert_jobs, remember_linkedin_jobs
 from asgiref.sync import sync_to_async
-from .utils import parse_salary, extract_skills, extract_seniority
+from django.db import close_old_connections
+from twisted.internet import task
+from scrapy.utils.defer import deferred_from_coro
+from .enrichment import Enricher
+from .metrics import PIPELINE_STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
 
 class ScraperServicePipeline:
+    """
+    Buffers scraped items, enriches each batch in a process pool, then upserts
+    the batches to the DB in the order they were scraped.
+    A batch is flushed when it is full, when its oldest item has waited
+    flush_interval seconds, and when the spider closes.
+    Jobs whose content fingerprint matches the stored one are dropped from the
+    batch before enrichment, so re-crawls only rewrite postings that changed.
+    A batch that fails is retried item by item; items that fail on their own are
+    logged and dropped, never retried later.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=10.0, processes=None, stats=None):
+        self.stats = stats
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enricher = Enricher(processes)
+        self.buffer = []
+        self._buffer_started = None
+        self._last_write = None
+        self._flush_timer = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            batch_size=crawler.settings.getint('PIPELINE_BATCH_SIZE', 100),
+            flush_interval=crawler.settings.getfloat('PIPELINE_FLUSH_INTERVAL', 10.0),
+            processes=crawler.settings.getint('ENRICHMENT_PROCESSES') or None,
+            stats=crawler.stats,
+        )
+
+    def open_spider(self, spider):
+        # Slow crawls (LinkedIn waits between requests) would otherwise hold
+        # a half-full batch until the end of the run.
+        self._flush_timer = task.LoopingCall(self._flush_if_stale)
+        self._flush_timer.start(min(1.0, self.flush_interval), now=False)
+
     async def process_item(self, item, spider):
-        await sync_to_async(self.save_job)(item)
+        if not self.buffer:
+            self._buffer_started = time.monotonic()
+        self.buffer.append(item)
+        if len(self.buffer) >= self.batch_size or self._is_stale():
+            await self.flush()
         return item
 
-    def save_job(self, item):
-        title = item.get('title')
-        description = item.get('description')
-        company = item.get('company')
-
-        # Combine text for analysis
-        text_to_scan = f"{title} {company} {description}"
-
-        min_sal, max_sal, curr = parse_salary(text_to_scan)
-        skills_found = extract_skills(text_to_scan)
-        seniority_level = extract_seniority(title, description)
-
-        job, created = Job.objects.update_or_create(
-            url=item.get('url'),
-            defaults={
-                'title': title,
-                'company': company,
-                'location': item.get('location') or "Remote",
-                'source': item.get('source'),
-                'posted_at': item.get('posted_at'),
-                'description': description,
-                'skills': skills_found,
-                'seniority': seniority_level,  # <--- Save it
-                'salary_min': min_sal,
-                'salary_max': max_sal,
-                'currency': curr,
-            }
-        )
-        return job
\ No newline at end of file
+    def close_spider(self, spider):
+        if self._flush_timer is not None and self._flush_timer.running:
+            self._flush_timer.stop()
+        return deferred_from_coro(self._close())
+
+    def _is_stale(self):
+        return bool(self.buffer) and time.monotonic() - self._buffer_started >= self.flush_interval
+
+    def _flush_if_stale(self):
+        if self._is_stale():
+            d = deferred_from_coro(self.flush())
+            # Keep the timer alive whatever happens; the error is only logged
+            d.addErrback(lambda failure: logger.error("Timed flush failed: %s", failure.value))
+            return d
+
+    async def _close(self):
+        await self.flush()
+        if self._last_write is not None:
+            await self._last_write
+
+    async def flush(self):
+        batch, self.buffer = self.buffer, []
+        if not batch:
+            return
+
+        # Batches are enriched in parallel, but each one waits for the
+        # previous write so rows land in scrape order.
+        previous_write = self._last_write
+        write_done = asyncio.get_running_loop().create_future()
+        self._last_write = write_done
+        try:
+            try:
+                await self.store(batch, previous_write)
+            except Exception as e:
+                # One bad row (value too long...) fails the whole statement: store the
+                # items one by one, so only those failing on their own are lost
+                logger.warning("Batch of %d items failed (%s), retrying item by item", len(batch), e)
+                if self.stats is not None:
+                    self.stats.inc_value('pipeline/failed_batches')
+                for item in batch:
+                    try:
+                        await self.store([item], previous_write)
+                    except Exception as e:
+                        logger.error("Dropped item %s: %s", ItemAdapter(item).get('url'), e)
+                        if self.stats is not None:
+                            self.stats.inc_value('pipeline/dropped_items')
+        finally:
+            write_done.set_result(None)
+
+    async def store(self, items, previous_write):
+        with self.timed('dedupe'):
+            rows = await sync_to_async(self.changed_rows)(items)
+        with self.timed('enrich'):
+            enriched = await self.enricher.enrich(rows) if rows else []
+        if previous_write is not None:
+            await previous_write
+        with self.timed('write'):
+            if rows:
+                await sync_to_async(self.save_batch)(rows, enriched)
+            await sync_to_async(remember_linkedin_jobs)(items)
+
+    @contextmanager
+    def timed(self, stage):
+        """Records the wall time of the block (crawl stat 'pipeline/<stage>_seconds' and metrics)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            PIPELINE_STAGE_SECONDS.labels(stage).observe(elapsed)
+            if self.stats is not None:
+                self.stats.inc_value(f'pipeline/{stage}_seconds', elapsed)
+
+    def changed_rows(self, items):
+        # Runs on the crawl runner's long-lived thread, where no request
+        # signals recycle the connection: drop it if the DB closed it
+        close_old_connections()
+        rows = [job_row(ItemAdapter(item)) for item in items]
+        changed = changed_rows(rows)
+        if self.stats is not None:
+            self.stats.inc_value('pipeline/unchanged_skipped', len(rows) - len(changed))
+        return changed
+
+    def save_batch(self, rows, enriched):
+        close_old_connections()
+        # One INSERT ... ON CONFLICT (url) DO UPDATE for the whole batch
+        upsert_jobs([{**row, **extracted} for row, extracted in zip(rows, enriched)])
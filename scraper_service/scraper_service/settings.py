@@ -10,15 +10,22 @@ import os
 import sys
 import django
 
-# 1. Add the project root to the Python path
-# This allows Scrapy to "see" the 'jobs' and 'config' folders
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Ingest mode:
+# - "direct": the pipeline enriches items and writes them to the DB (needs Django here)
+# - "stream": spiders only append items to a Redis stream; `manage.py ingest_jobs`
+#   enriches and upserts them. Spider processes then never load Django.
+SCRAPER_INGEST_MODE = os.environ.get("SCRAPER_INGEST_MODE", "direct")
 
-# 2. Point to the Django settings file
-os.environ['DJANGO_SETTINGS_MODULE'] = 'config.settings'
+if SCRAPER_INGEST_MODE == "direct":
+    # 1. Add the project root to the Python path
+    # This allows Scrapy to "see" the 'jobs' and 'config' folders
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-# 3. Initialize Django
-django.setup()
+    # 2. Point to the Django settings file
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'config.settings'
+
+    # 3. Initialize Django
+    django.setup()
 
 BOT_NAME = "scraper_service"
 
@@ -39,10 +46,25 @@ ROBOTSTXT_OBEY = False
 # Disguise as Chrome on Windows
 # USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
-# Be polite but persistent
+# Be polite but persistent: defaults for domains without a throttle target
 DOWNLOAD_DELAY = 2  # Wait 2 seconds between requests to avoid bans
 CONCURRENT_REQUESTS_PER_DOMAIN = 1
 
+# Per-domain starting point for AdaptiveThrottleMiddleware, which slows a domain down
+# on 429/999, Retry-After or slow responses and speeds it back up to these values.
+# The RSS feeds are single static files and tolerate bursts; LinkedIn bans aggressive clients.
+THROTTLE_TARGETS = {
+    "linkedin.com": {"delay": 2.0, "concurrency": 1},
+    "weworkremotely.com": {"delay": 0.25, "concurrency": 4},
+    "remoteok.com": {"delay": 0.25, "concurrency": 4},
+}
+THROTTLE_MAX_DELAY = 60  # seconds
+THROTTLE_MAX_LATENCY = 5  # seconds; slower responses count as a sign of overload
+THROTTLE_RECOVERY_STREAK = 10  # good responses before one more concurrent request
+
+# 999 is LinkedIn's "request denied" status
+RETRY_HTTP_CODES = [500, 502, 503, 504, 522, 524, 408, 429, 999]
+
 # Disable cookies (enabled by default)
 #COOKIES_ENABLED = False
 
@@ -57,9 +79,10 @@ CONCURRENT_REQUESTS_PER_DOMAIN = 1
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    "scraper_service.middlewares.ScraperServiceSpiderMiddleware": 543,
-#}
+SPIDER_MIDDLEWARES = {
+    # Times the spider callbacks (parse stage of the crawl stats)
+    "scraper_service.middlewares.ParseTimingMiddleware": 950,
+}
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
@@ -67,21 +90,62 @@ DOWNLOADER_MIDDLEWARES = {
     # 1. Disable the default UserAgent middleware (set to None)
     'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
 
-    # 2. Enable the Random UserAgent middleware (set priority to 400)
-    'scrapy_user_agents.middlewares.RandomUserAgentMiddleware': 400,
+    # 2. Enable the Random UserAgent middleware (set priority to 400),
+    # parsed once per process instead of once per crawl
+    'scraper_service.middlewares.CachedRandomUserAgentMiddleware': 400,
+
+    # 3. Adaptive per-domain delay/concurrency (sees 429/999 before RetryMiddleware at 550)
+    'scraper_service.middlewares.AdaptiveThrottleMiddleware': 600,
+
+    # 4. Shared request budget across all parallel crawls (after the HTTP cache)
+    'scraper_service.middlewares.SharedRateLimitMiddleware': 950,
+}
+
+# Redis used for state shared between crawls (rate limits...)
+SCRAPER_REDIS_URL = os.environ.get("SCRAPER_REDIS_URL", os.environ.get("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0"))
+
+# Per-domain budget shared by every crawler on every Celery worker:
+# at most one request every N seconds. LinkedIn bans aggressive clients.
+SHARED_RATE_LIMITS = {
+    "linkedin.com": 2.0,
 }
 
+# LinkedIn jobs already stored are not fetched again (no detail request)
+# until their details are older than this many seconds
+LINKEDIN_DETAIL_MAX_AGE = 7 * 24 * 3600
+
+# LinkedIn list pages are fetched while they bring new cards, up to LINKEDIN_MAX_PAGES.
+# Productive queries (at least LINKEDIN_DEEP_MIN_NEW_RATIO new cards per page)
+# may go on up to LINKEDIN_DEEP_MAX_PAGES.
+LINKEDIN_MAX_PAGES = 5
+LINKEDIN_DEEP_MAX_PAGES = 40
+LINKEDIN_DEEP_MIN_NEW_RATIO = 0.5
+
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-#EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-#}
+EXTENSIONS = {
+    # Prometheus metrics (requests, items, bans, throughput), see jobs/metrics.py
+    "scraper_service.metrics.CrawlMetrics": 500,
+}
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-ITEM_PIPELINES = {
-   "scraper_service.pipelines.ScraperServicePipeline": 300,
+# One entry per ingest mode; a crawl can pick the other one (see jobs.crawler.run_crawls)
+INGEST_PIPELINES = {
+    "direct": {"scraper_service.pipelines.ScraperServicePipeline": 300},
+    "stream": {"scraper_service.stream.StreamExportPipeline": 300},
 }
+ITEM_PIPELINES = INGEST_PIPELINES[SCRAPER_INGEST_MODE]
+
+# Stream mode: approximate max length of the Redis ingest stream
+INGEST_STREAM_MAXLEN = 1_000_000
+
+# Items are enriched (salary, skills, seniority) in batches on a process pool,
+# then upserted in one statement per batch. A batch is flushed when it is full,
+# after PIPELINE_FLUSH_INTERVAL seconds, or when the spider closes.
+PIPELINE_BATCH_SIZE = 100
+PIPELINE_FLUSH_INTERVAL = 10  # seconds
+ENRICHMENT_PROCESSES = 0  # 0 = one worker per CPU core
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -104,5 +168,24 @@ ITEM_PIPELINES = {
 #HTTPCACHE_IGNORE_HTTP_CODES = []
 #HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
 
+# Record/replay archive (see `manage.py bench_scrape`):
+# - "record": crawl the network and store every response in HTTPCACHE_DIR
+# - "replay": serve every request from the archive, never touch the network
+# Archive runs are self-contained: no Redis state is read or written.
+SCRAPER_ARCHIVE_MODE = os.environ.get("SCRAPER_ARCHIVE_MODE")
+
+if SCRAPER_ARCHIVE_MODE:
+    HTTPCACHE_ENABLED = True
+    HTTPCACHE_DIR = os.environ.get("SCRAPER_ARCHIVE_DIR", "archive")
+    HTTPCACHE_STORAGE = "scraper_service.archive.ArchiveCacheStorage"
+    HTTPCACHE_EXPIRATION_SECS = 0
+    HTTPCACHE_IGNORE_HTTP_CODES = RETRY_HTTP_CODES
+    HTTPCACHE_IGNORE_MISSING = SCRAPER_ARCHIVE_MODE == "replay"
+    SCRAPER_REDIS_URL = None
+
+if SCRAPER_ARCHIVE_MODE == "replay":
+    DOWNLOAD_DELAY = 0
+    THROTTLE_TARGETS = {}
+
 # Set settings whose default value is deprecated to a future-proof value
 FEED_EXPORT_ENCODING = "utf-8"
@@ -1,22 +1,73 @@
+import time
+import redis
+import redis.asyncio
 import scrapy
-from datetime import date
-from ..utils import parse_relative_date
+from ..utils import parse_relative_date, linkedin_job_id, KNOWN_LINKEDIN_JOBS
 from ..items import JobItem
 
 
 class LinkedInSpider(scrapy.Spider):
+    """
+    Pagination follows the results: the next list page is only requested while
+    pages bring new cards (not stored yet, not seen earlier in this crawl).
+    Up to LINKEDIN_MAX_PAGES pages any new card is enough; past that, up to
+    LINKEDIN_DEEP_MAX_PAGES, a page must be mostly new (LINKEDIN_DEEP_MIN_NEW_RATIO).
+    """
     name = "linkedin"
 
-    def start_requests(self):
+    async def start(self):
+        self.known_jobs = await self.load_known_jobs()
+        self.seen_jobs = set()
+
         keyword = getattr(self, 'keyword', 'Python')
         location = getattr(self, 'location', 'Europe')
-        base_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={keyword}&location={location}&start={{}}"
+        self.base_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={keyword}&location={location}&start={{}}"
+
+        yield self.list_request(start=0, page=1)
+
+    def list_request(self, start, page):
+        self.crawler.stats.inc_value('linkedin/list_pages')
+        return scrapy.Request(url=self.base_url.format(start), callback=self.parse_list,
+                              meta={'start': start, 'page': page})
+
+    def next_list_request(self, response, cards, new_cards):
+        """The next list page, or None when this query has run out of new results."""
+        page = response.meta['page']
+        settings = self.settings
+
+        if not new_cards or page >= settings.getint('LINKEDIN_DEEP_MAX_PAGES'):
+            return None
+        if page >= settings.getint('LINKEDIN_MAX_PAGES') and \
+                new_cards / cards < settings.getfloat('LINKEDIN_DEEP_MIN_NEW_RATIO'):
+            return None
+        # Pages are offsets into the result list; step by what this page returned
+        return self.list_request(start=response.meta['start'] + cards, page=page + 1)
 
-        # Scrape 0 to 100 (keep it low for testing, increase later)
-        for i in range(0, 101, 25):
-            yield scrapy.Request(url=base_url.format(i), callback=self.parse_list)
+    async def load_known_jobs(self):
+        """
+        IDs of the postings already stored whose details were fetched less than
+        LINKEDIN_DETAIL_MAX_AGE seconds ago. Their detail request is skipped.
+        Pass full=1 to refetch everything.
+        """
+        redis_url = self.settings.get('SCRAPER_REDIS_URL')
+        if getattr(self, 'full', None) or not redis_url:
+            return set()
+
+        client = redis.asyncio.from_url(redis_url, decode_responses=True)
+        min_fetched_at = time.time() - self.settings.getint('LINKEDIN_DETAIL_MAX_AGE')
+        try:
+            # Older entries are due for a refresh anyway
+            await client.zremrangebyscore(KNOWN_LINKEDIN_JOBS, '-inf', f'({min_fetched_at}')
+            return set(await client.zrange(KNOWN_LINKEDIN_JOBS, 0, -1))
+        except redis.RedisError as e:
+            self.logger.warning("Known jobs unavailable, fetching every detail page: %s", e)
+            return set()
+        finally:
+            await client.aclose()
 
     def parse_list(self, response):
+        cards = new_cards = 0
+
         for job in response.css("li"):
             title = job.css("h3.base-search-card__title::text").get()
             company = job.css("h4.base-search-card__subtitle a::text").get()
@@ -46,25 +97,34 @@ class LinkedInSpider(scrapy.Spider):
             item['salary_max'] = None
             item['currency'] = None
 
-            try:
-                # Extract ID to get full description
-                slug = raw_url.split("view/")[1].split("/")[0].split("?")[0]
-                job_id = slug.split('-')[-1]
-
-                if not job_id.isdigit():
-                    job_id = slug if slug.isdigit() else None
+            # Extract ID to get full description
+            job_id = linkedin_job_id(raw_url)
 
-                if job_id:
-                    detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-                    yield scrapy.Request(url=detail_url, callback=self.parse_detail, meta={'item': item})
-                else:
-                    item['description'] = ""
-                    yield item
+            cards += 1
+            if job_id in self.seen_jobs:
+                # Results shifted between two pages
+                continue
+            if job_id:
+                self.seen_jobs.add(job_id)
 
-            except (IndexError, ValueError):
+            if job_id in self.known_jobs:
+                # Already stored; yielding the card alone would blank its description
+                self.crawler.stats.inc_value('linkedin/details_skipped')
+            elif job_id:
+                new_cards += 1
+                self.crawler.stats.inc_value('spider/detail_requests')
+                detail_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+                yield scrapy.Request(url=detail_url, callback=self.parse_detail, meta={'item': item})
+            else:
+                new_cards += 1
                 item['description'] = ""
                 yield item
 
+        self.crawler.stats.inc_value('spider/cards', cards)
+        next_page = self.next_list_request(response, cards, new_cards)
+        if next_page is not None:
+            yield next_page
+
     def parse_detail(self, response):
         item = response.meta['item']
 
@@ -1,45 +1,38 @@
-import scrapy
-from datetime import datetime
+from datetime import date
+from ..feeds import ConditionalFeedSpider
 from ..items import JobItem
 
 
-class RemoteOKSpider(scrapy.Spider):
+class RemoteOKSpider(ConditionalFeedSpider):
     name = "remoteok"
     allowed_domains = ["remoteok.com"]
     # RemoteOK has a legal RSS feed too!
     start_urls = ["https://remoteok.com/rss"]
 
-    def parse(self, response):
-        response.selector.register_namespace('content', 'http://purl.org/rss/1.0/modules/content/')
+    def parse_entry(self, item, published):
+        title = item.xpath('title/text()').get()
+        link = item.xpath('link/text()').get()
+        description = item.xpath('description/text()').get()
 
-        for item in response.xpath('//item'):
-            title = item.xpath('title/text()').get()
-            link = item.xpath('link/text()').get()
-            pub_date_str = item.xpath('pubDate/text()').get()
-            description = item.xpath('description/text()').get()
+        # Extract Company from title (Format: "Company: Job")
+        company = "RemoteOK"
+        if ":" in title:
+            parts = title.split(":", 1)
+            company = parts[0].strip()
+            title = parts[1].strip()
 
-            # Extract Company from title (Format: "Company: Job")
-            company = "RemoteOK"
-            if ":" in title:
-                parts = title.split(":", 1)
-                company = parts[0].strip()
-                title = parts[1].strip()
+        posted_at = published.date() if published else date.today()
 
-            try:
-                posted_at = datetime.strptime(pub_date_str, "%a, %d %b %Y %H:%M:%S %z").date()
-            except:
-                posted_at = datetime.today().date()
-
-            yield JobItem(
-                title=title,
-                company=company,
-                location="Remote",
-                url=link,
-                posted_at=posted_at,
-                description=description,
-                source="RemoteOK",
-                skills=[],
-                salary_min=None,
-                salary_max=None,
-                currency=None
-            )
\ No newline at end of file
+        return JobItem(
+            title=title,
+            company=company,
+            location="Remote",
+            url=link,
+            posted_at=posted_at,
+            description=description,
+            source="RemoteOK",
+            skills=[],
+            salary_min=None,
+            salary_max=None,
+            currency=None
+        )
@@ -0,0 +1,54 @@
+import json
+from datetime import date
+
+import redis.asyncio
+from itemadapter import ItemAdapter
+from scrapy.utils.defer import deferred_from_coro
+
+# Redis stream the spiders append to in "stream" ingest mode.
+# `python manage.py ingest_jobs` consumes it and writes to the DB.
+INGEST_STREAM = "scraper:items"
+# Entries the ingest worker gave up on, with the error, for inspection and replay
+DEAD_LETTER_STREAM = f"{INGEST_STREAM}:dead"
+
+
+def encode_item(item):
+    """Serializes a scraped item into a stream entry."""
+    fields = ItemAdapter(item).asdict()
+    return {'item': json.dumps(fields, default=lambda v: v.isoformat() if isinstance(v, date) else str(v))}
+
+
+def decode_item(entry):
+    """Inverse of encode_item(). Dates stay ISO strings, the ORM parses them on save."""
+    return json.loads(entry['item'])
+
+
+class StreamExportPipeline:
+    """
+    Ingest-mode pipeline: appends every item to a durable Redis stream and returns.
+    No Django, no DB connection and no enrichment in the spider process;
+    the ingest worker batches, enriches and upserts the entries.
+    """
+
+    def __init__(self, redis_url, maxlen):
+        self.redis_url = redis_url
+        self.maxlen = maxlen
+        self.redis = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            redis_url=crawler.settings.get('SCRAPER_REDIS_URL'),
+            maxlen=crawler.settings.getint('INGEST_STREAM_MAXLEN', 1_000_000),
+        )
+
+    async def process_item(self, item, spider):
+        if self.redis is None:
+            self.redis = redis.asyncio.from_url(self.redis_url)
+        # Approximate trimming keeps the stream bounded if the worker falls far behind
+        await self.redis.xadd(INGEST_STREAM, encode_item(item), maxlen=self.maxlen, approximate=True)
+        return item
+
+    def close_spider(self, spider):
+        if self.redis is not None:
+            return deferred_from_coro(self.redis.aclose())
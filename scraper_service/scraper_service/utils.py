@@ -1,4 +1,5 @@
 import re
+from bisect import bisect_left
 from datetime import date, timedelta
 from .constants import (
     TECH_KEYWORDS, NEGATION_PATTERNS, SENIORITY_MAP,
@@ -6,6 +7,82 @@ from .constants import (
 )
 
 
+# Skills matched as plain substrings (no word boundaries), e.g. "C++" / "C#"
+UNBOUNDED_SKILLS = ["C++", "C#", ".NET"]
+
+# Context window (in chars) around a skill that is checked for negations
+NEGATION_WINDOW = 50
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _skill_pattern(skill):
+    pattern = re.escape(skill.lower())
+    if skill in UNBOUNDED_SKILLS:
+        return pattern
+    return r'\b' + pattern + r'\b'
+
+
+def _trie_pattern(words):
+    """Builds one regex alternation for the words, factored by shared prefixes."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+# --- Skill matcher (built once at import) ---
+# A word-bounded keyword that starts with a letter can only match where its first word
+# ("node" for "Node.js") appears as a whole word. One scan for those first words finds
+# every candidate position; only the few keywords sharing that word are then checked.
+_SKILL_PATTERNS = {skill: re.compile(_skill_pattern(skill)) for skill in TECH_KEYWORDS}
+_SKILLS_BY_FIRST_WORD = {}
+_ALWAYS_SCANNED_SKILLS = []  # "C++", ".NET Core"... can start mid-word
+
+for _skill in TECH_KEYWORDS:
+    _first_word = _WORD_RE.match(_skill.lower())
+    if _skill in UNBOUNDED_SKILLS or not _first_word:
+        _ALWAYS_SCANNED_SKILLS.append(_skill)
+    else:
+        _SKILLS_BY_FIRST_WORD.setdefault(_first_word.group(), []).append(_skill)
+
+_FIRST_WORD_SCANNER = re.compile(r'\b' + _trie_pattern(_SKILLS_BY_FIRST_WORD) + r'\b')
+
+_NEGATION_PATTERNS = [re.compile(neg) for neg in NEGATION_PATTERNS]
+
+
+def _negation_index(text_lower):
+    """
+    Finds every negation phrase once per document.
+    Returns (starts, min_ends): span starts in order, and for each index the
+    smallest end of any span starting at or after it.
+    """
+    spans = sorted(m.span() for neg in _NEGATION_PATTERNS for m in neg.finditer(text_lower))
+    starts = [start for start, _ in spans]
+    min_ends = [end for _, end in spans]
+    for i in range(len(min_ends) - 2, -1, -1):
+        min_ends[i] = min(min_ends[i], min_ends[i + 1])
+    return starts, min_ends
+
+
+def _is_negated(negations, start, end):
+    # A negation counts if it lies entirely inside the context window
+    starts, min_ends = negations
+    i = bisect_left(starts, start - NEGATION_WINDOW)
+    return i < len(starts) and min_ends[i] <= end + NEGATION_WINDOW
+
+
 def extract_skills(text):
     """
     Finds skills but ignores them if they appear near 'no experience' phrases.
@@ -15,38 +92,28 @@ def extract_skills(text):
 
     found_skills = set()
     text_lower = text.lower()
+    negations = _negation_index(text_lower)
+
+    # 1. Keywords found through their first word
+    for word in _FIRST_WORD_SCANNER.finditer(text_lower):
+        start = word.start()
+        for skill in _SKILLS_BY_FIRST_WORD[word.group()]:
+            if skill in found_skills:
+                continue
+            match = _SKILL_PATTERNS[skill].match(text_lower, start)
+            # Skip occurrences with a negation phrase in the 50-char context window
+            if match and not _is_negated(negations, start, match.end()):
+                found_skills.add(skill)
 
-    for skill in TECH_KEYWORDS:
-        # Escape the skill for regex (e.g., C++)
-        skill_esc = re.escape(skill.lower())
-        pattern = r'\b' + skill_esc + r'\b'
-
-        # C++ and C# handling
-        if skill in ["C++", "C#", ".NET"]:
-            pattern = re.escape(skill.lower())
-
-        # Find all occurrences of the skill
-        for match in re.finditer(pattern, text_lower):
-            start, end = match.span()
-
-            # Context Window: 50 chars before and 50 chars after
-            context_start = max(0, start - 50)
-            context_end = min(len(text_lower), end + 50)
-            context_window = text_lower[context_start:context_end]
-
-            # Check for negations in this window
-            is_negative = False
-            for neg in NEGATION_PATTERNS:
-                if re.search(neg, context_window):
-                    is_negative = True
-                    break
-
-            if not is_negative:
+    # 2. Keywords that can start anywhere
+    for skill in _ALWAYS_SCANNED_SKILLS:
+        for match in _SKILL_PATTERNS[skill].finditer(text_lower):
+            if not _is_negated(negations, *match.span()):
                 found_skills.add(skill)
-                # Once found valid, move to next skill
                 break
 
-    return list(found_skills)
+    # Keep the order of TECH_KEYWORDS so results are stable between runs
+    return [skill for skill in TECH_KEYWORDS if skill in found_skills]
 
 
 def extract_seniority(title, description):
@@ -72,9 +139,63 @@ def extract_seniority(title, description):
     return "Not Specified"
 
 
+# --- Salary rules (compiled once at import) ---
+# Candidate tokens for each strategy
+_SALARY_DIGIT_RE = re.compile(r'\d')
+_SALARY_RANGE_K_RE = re.compile(r'(\d+)\s*[-–to]\s*(\d+)\s*[kK]')
+_SALARY_RANGE_RE = re.compile(r'(\d+)\s*[-–to]\s*(\d+)')
+_SALARY_NUMBER_RE = re.compile(r'(\d+[,\.]?\d*)\s*([kK])?')
+
+# One alternation per rule set instead of one search per term
+_SALARY_IGNORE_RE = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in SALARY_IGNORE_TERMS) + r')\b')
+_SALARY_HINT_RE = re.compile(r'\b(?:' + '|'.join(SALARY_HINTS) + r')\b')
+
+# Periods keep their priority order: the first period with any match wins
+_PERIOD_MULTIPLIERS = {'monthly': 12, 'yearly': 1, 'hourly': 2080, 'daily': 260}  # 40hr * 52w / 5d * 52w
+_SALARY_PERIOD_RES = [
+    (re.compile('|'.join(patterns)), _PERIOD_MULTIPLIERS[period])
+    for period, patterns in SALARY_MULTIPLIERS.items()
+]
+
+_SALARY_CURRENCY_SIGNS = ['$', '€', '£', 'bgn']
+
+
+def _annual_multiplier(text_lower, end_pos):
+    """Detects a pay period right after a number (e.g. "5000 per month")."""
+    # Look 30 chars ahead
+    suffix = text_lower[end_pos:end_pos + 30]
+
+    for period_re, multiplier in _SALARY_PERIOD_RES:
+        if period_re.search(suffix):
+            return multiplier
+    return 1  # Default to yearly if unknown
+
+
+def _is_valid_salary(text_lower, match_obj, has_k):
+    """Tells a salary figure apart from counts like "250,000 users"."""
+    start, end = match_obj.span()
+
+    # 1. Ignore "250,000 users"
+    if _SALARY_IGNORE_RE.search(text_lower[end:end + 40]):
+        return False
+
+    # 2. Accept if explicit currency, 'k' suffix, or salary keyword
+    if has_k:
+        return True
+    around = text_lower[max(0, start - 5):end + 5]
+    if any(sign in around for sign in _SALARY_CURRENCY_SIGNS):
+        return True
+    window = text_lower[max(0, start - 50):min(len(text_lower), end + 50)]
+    return bool(_SALARY_HINT_RE.search(window))
+
+
 def parse_salary(text):
     if not text: return None, None, None
 
+    # Every strategy needs digits, most descriptions have none worth parsing
+    if not _SALARY_DIGIT_RE.search(text):
+        return None, None, None
+
     # 1. Detect Currency
     currency = "USD"
     if '€' in text or 'EUR' in text:
@@ -85,55 +206,24 @@ def parse_salary(text):
     text_lower = text.lower()
     clean_numbers = []
 
-    # --- Helper: Detect Multiplier based on context ---
-    def get_annual_multiplier(end_pos):
-        # Look 30 chars ahead (e.g., "5000 per month")
-        suffix = text_lower[end_pos:end_pos + 30]
-
-        for period, patterns in SALARY_MULTIPLIERS.items():
-            for pattern in patterns:
-                if re.search(pattern, suffix):
-                    if period == 'monthly': return 12
-                    if period == 'hourly': return 2080  # 40hr * 52w
-                    if period == 'daily': return 260  # 5d * 52w
-                    if period == 'yearly': return 1
-        return 1  # Default to yearly if unknown
-
-    # --- Helper: Validator ---
-    def is_valid_match(match_obj, has_k):
-        start, end = match_obj.span()
-        suffix = text_lower[end:end + 40]
-
-        # 1. Ignore "250,000 users"
-        if any(re.search(r'\b' + re.escape(term) + r'\b', suffix) for term in SALARY_IGNORE_TERMS):
-            return False
-
-        # 2. Accept if explicit currency, 'k' suffix, or salary keyword
-        window = text_lower[max(0, start - 50):min(len(text_lower), end + 50)]
-        if has_k: return True
-        if any(s in text_lower[max(0, start - 5):end + 5] for s in ['$', '€', '£', 'bgn']): return True
-        if any(re.search(r'\b' + h + r'\b', window) for h in SALARY_HINTS): return True
-
-        return False
-
     # Strategy A: Ranges (80-100k)
-    for m in re.finditer(r'(\d+)\s*[-–to]\s*(\d+)\s*[kK]', text_lower):
-        if is_valid_match(m, True):
-            mult = get_annual_multiplier(m.end())
+    for m in _SALARY_RANGE_K_RE.finditer(text_lower):
+        if _is_valid_salary(text_lower, m, True):
+            mult = _annual_multiplier(text_lower, m.end())
             clean_numbers.extend([int(m.group(1)) * 1000 * mult, int(m.group(2)) * 1000 * mult])
 
     # Strategy B: Ranges without k (4000-5000 / month)
     if not clean_numbers:
-        for m in re.finditer(r'(\d+)\s*[-–to]\s*(\d+)', text_lower):
+        for m in _SALARY_RANGE_RE.finditer(text_lower):
             # Check if this range is followed by a period (e.g. /month)
-            mult = get_annual_multiplier(m.end())
+            mult = _annual_multiplier(text_lower, m.end())
             # Only accept "naked" ranges if we found a period multiplier (implies it's a rate)
-            if mult > 1 and is_valid_match(m, False):
+            if mult > 1 and _is_valid_salary(text_lower, m, False):
                 clean_numbers.extend([int(m.group(1)) * mult, int(m.group(2)) * mult])
 
     # Strategy C: Individual numbers
     if not clean_numbers:
-        for m in re.finditer(r'(\d+[,\.]?\d*)\s*([kK])?', text_lower):
+        for m in _SALARY_NUMBER_RE.finditer(text_lower):
             val_str = m.group(1).replace(',', '').replace('.', '')
             if not val_str.isdigit(): continue
 
@@ -141,8 +231,8 @@ def parse_salary(text):
             has_k = (m.group(2) and m.group(2).lower() == 'k')
             if has_k: val *= 1000
 
-            if is_valid_match(m, has_k):
-                mult = get_annual_multiplier(m.end())
+            if _is_valid_salary(text_lower, m, has_k):
+                mult = _annual_multiplier(text_lower, m.end())
                 annual_val = val * mult
 
                 # Sanity Check (Annualized)
@@ -178,4 +268,21 @@ def parse_relative_date(text):
     except ValueError:
         pass
 
-    return today
\ No newline at end of file
+    return today
+
+
+# Redis sorted set of stored LinkedIn job IDs, scored by the time their details were fetched
+KNOWN_LINKEDIN_JOBS = "scraper:linkedin:known"
+
+
+def linkedin_job_id(url):
+    """Extracts the job ID from a LinkedIn job URL ('.../jobs/view/<slug>-<id>'), or None."""
+    try:
+        slug = url.split("view/")[1].split("/")[0].split("?")[0]
+    except (AttributeError, IndexError):
+        return None
+
+    job_id = slug.split('-')[-1]
+    if not job_id.isdigit():
+        job_id = slug if slug.isdigit() else None
+    return job_id